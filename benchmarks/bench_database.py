@@ -0,0 +1,165 @@
+"""Time the main Database calls against synthetic histories of several sizes.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_database --scales week,year --save-baseline baseline.json
+    python -m benchmarks.bench_database --scales week,year --compare baseline.json
+"""
+import argparse
+import json
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from preformancetracker.database import Database
+from .synthetic import SCALES, build_scale
+
+def _sample_record(rng):
+    return {
+        'task_name': 'Pick Aisle A', 'target_time': 45, 'actual_time': rng.uniform(35, 60),
+        'performance_percentage': rng.uniform(75, 125), 'start_time': '09:00', 'end_time': '09:45',
+        'break_time': 0, 'has_break': False, 'delays_time': 0, 'has_delays': False,
+        'delay_notes': '', 'skill': 'Picker', 'paid_break_time': 0, 'unpaid_break_time': 0,
+    }
+
+def operations(days, rng):
+    """Return (name, call(db)) pairs for the benchmarked Database methods.
+
+    The stats cache is cleared before each stats call so storage is measured,
+    not the in-memory cache.
+    """
+    today = date.today()
+
+    def random_day():
+        return datetime.combine(today - timedelta(days=rng.randrange(days)), datetime.min.time())
+
+    def cold(method):
+        def call(db, *args):
+            db.stats_cache.clear()
+            return getattr(db, method)(*args)
+        return call
+
+    return [
+        ('save_record', lambda db: db.save_record(_sample_record(rng))),
+        ('get_daily_stats', lambda db: cold('get_daily_stats')(db, random_day())),
+        ('get_weekly_stats', lambda db: cold('get_weekly_stats')(db, random_day())),
+        ('get_stats_for_date_range', lambda db: cold('get_stats_for_date_range')(
+            db, (today - timedelta(days=min(days, 90))).isoformat(), today.isoformat()
+        )),
+        ('get_records_for_date', lambda db: db.get_records_for_date(random_day())),
+        ('get_recent_records', lambda db: db.get_recent_records(20)),
+    ]
+
+def run_scale(scale, directory, repeat, seed=0):
+    """Build a scale's databases and time each operation, cycling through the pickers."""
+    started = time.perf_counter()
+    built = build_scale(directory, scale, seed=seed)
+    build_seconds = time.perf_counter() - started
+    days, _ = SCALES[scale]
+    databases = [Database(db_path=path, slow_query_ms=None) for path, _ in built]
+    rng = random.Random(seed)
+    results = {}
+    try:
+        for name, call in operations(days, rng):
+            for db in databases:
+                call(db)  # warm up connections and statement caches
+            timings = []
+            for index in range(repeat):
+                db = databases[index % len(databases)]
+                op_started = time.perf_counter()
+                call(db)
+                timings.append((time.perf_counter() - op_started) * 1000)
+            timings.sort()
+            results[name] = {
+                'runs': repeat,
+                'median_ms': statistics.median(timings),
+                'p95_ms': timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+                'min_ms': timings[0],
+            }
+    finally:
+        for db in databases:
+            db.close()
+    return {
+        'records': sum(count for _, count in built),
+        'databases': len(built),
+        'build_seconds': build_seconds,
+        'operations': results,
+    }
+
+def print_results(results, baseline=None, threshold=10.0):
+    """Print a timing table, with the change against a baseline if one is given.
+
+    Returns the number of operations whose median regressed by more than threshold percent.
+    """
+    regressions = 0
+    for scale, result in results.items():
+        print(f"\n{scale}: {result['records']} records in {result['databases']} database(s), "
+              f"built in {result['build_seconds']:.1f}s")
+        print(f"  {'operation':<26}{'median ms':>11}{'p95 ms':>10}{'min ms':>10}  vs baseline")
+        base_ops = (baseline or {}).get(scale, {}).get('operations', {})
+        for name, timing in result['operations'].items():
+            change = ''
+            base = base_ops.get(name)
+            if base and base['median_ms'] > 0:
+                percent = (timing['median_ms'] - base['median_ms']) / base['median_ms'] * 100
+                change = f"{percent:+.1f}%"
+                if percent > threshold:
+                    change += '  REGRESSION'
+                    regressions += 1
+            print(f"  {name:<26}{timing['median_ms']:>11.3f}{timing['p95_ms']:>10.3f}{timing['min_ms']:>10.3f}  {change}")
+    return regressions
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.bench_database',
+        description='Benchmark Database calls on synthetic histories.'
+    )
+    parser.add_argument('--scales', default='week,year,five_years',
+                        help=f"Comma separated scales to run: {', '.join(SCALES)} (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=50, help='Timed calls per operation (default: %(default)s)')
+    parser.add_argument('--dir', help='Directory for the generated databases (default: a temporary directory)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic history')
+    parser.add_argument('--save-baseline', metavar='PATH', help='Write the results to a JSON baseline file')
+    parser.add_argument('--compare', metavar='PATH', help='Compare against a saved JSON baseline')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='Percent slowdown of the median reported as a regression (default: %(default)s)')
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    scales = [scale.strip() for scale in args.scales.split(',') if scale.strip()]
+    unknown = [scale for scale in scales if scale not in SCALES]
+    if unknown:
+        print(f"Unknown scale(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {scale: run_scale(scale, args.dir or tmp, args.repeat, seed=args.seed) for scale in scales}
+
+    regressions = print_results(results, baseline, args.threshold)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'created': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'sqlite': sqlite3.sqlite_version,
+                'repeat': args.repeat,
+                'results': results,
+            }, f, indent=2)
+        print(f"\nSaved baseline to {args.save_baseline}")
+    if baseline is not None and regressions:
+        print(f"\n{regressions} operation(s) slower than the baseline by more than {args.threshold}%")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""Build each view headlessly on Toga's dummy backend against a seeded database.
+
+Reports, per view, the time to construct it, the time until its background
+loads have filled it in, the time to revisit it from the view cache, the
+number of widgets and the number of SQL statements it ran. Run from the
+repository root (toga-dummy must be installed):
+
+    python -m benchmarks.bench_views --days 365 --max-queries 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+
+# Both must be set before toga is imported and the app picks its data directory.
+os.environ.setdefault('TOGA_BACKEND', 'toga_dummy')
+os.environ['HOME'] = tempfile.mkdtemp(prefix='bench-views-')
+
+VIEWS = ['home', 'view_records', 'statistics', 'calendar', 'weekly', 'daily', 'add_record', 'debug']
+
+class QueryCounter:
+    """sqlite3 trace callback counting top-level statements (trigger bodies are skipped)."""
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, sql):
+        if not sql.startswith('--'):
+            self.count += 1
+
+def count_widgets(widget):
+    """Count a widget and everything below it, including scroll container content."""
+    children = list(widget.children)
+    content = getattr(widget, 'content', None)
+    if content is not None and not isinstance(content, str) and content not in children:
+        children.append(content)
+    return 1 + sum(count_widgets(child) for child in children)
+
+def settle(app):
+    """Run the event loop until the background tasks the view scheduled have finished."""
+    loop = app.loop
+    for _ in range(100):
+        pending = [task for task in asyncio.all_tasks(loop) if not task.done()]
+        if not pending:
+            return
+        loop.run_until_complete(asyncio.wait(pending, timeout=5))
+
+def seed(app, days):
+    """Fill the app's database with synthetic history and return the record count."""
+    from .synthetic import generate_history
+    total = 0
+    for records, _ in generate_history(days):
+        total += app.db.insert_records_bulk(records)
+    return total
+
+def measure(app, view_name, counter):
+    """Build a view from scratch, then revisit it; return its timings and counts."""
+    app.invalidate_views()
+    app.db.stats_cache.clear()
+    counter.count = 0
+    started = time.perf_counter()
+    app.set_view(view_name)
+    built = time.perf_counter() - started
+    settle(app)
+    loaded = time.perf_counter() - started
+    queries = counter.count
+    widgets = sum(count_widgets(child) for child in app.main_container.children)
+
+    app.set_view('home' if view_name != 'home' else 'view_records')
+    settle(app)
+    started = time.perf_counter()
+    app.set_view(view_name)
+    settle(app)
+    revisit = time.perf_counter() - started
+    return {'build_ms': built * 1000, 'loaded_ms': loaded * 1000, 'revisit_ms': revisit * 1000,
+            'widgets': widgets, 'queries': queries}
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.bench_views',
+        description='Benchmark view construction on the Toga dummy backend.'
+    )
+    parser.add_argument('--days', type=int, default=365, help='Days of synthetic history to seed (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=5, help='Builds per view (default: %(default)s)')
+    parser.add_argument('--views', default=','.join(VIEWS), help='Comma separated views to build')
+    parser.add_argument('--max-queries', type=int,
+                        help='Exit non-zero if any view runs more SQL statements than this')
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    from preformancetracker.app import main as create_app
+    from preformancetracker.debug import logger
+
+    # The views still use Pack options that newer Toga releases deprecate, and
+    # importing toga turns those warnings back on, so silence them afterwards.
+    warnings.simplefilter('ignore', DeprecationWarning)
+
+    logger.setLevel('WARNING')
+    app = create_app()
+    counter = QueryCounter()
+    try:
+        records = seed(app, args.days)
+        app.db.set_trace_callback(counter)
+        print(f"Seeded {records} records over {args.days} days\n")
+        print(f"  {'view':<14}{'build ms':>10}{'loaded ms':>11}{'revisit ms':>12}{'widgets':>9}{'queries':>9}")
+        over_budget = []
+        for view_name in [name.strip() for name in args.views.split(',') if name.strip()]:
+            runs = [measure(app, view_name, counter) for _ in range(args.repeat)]
+            widgets, queries = runs[-1]['widgets'], runs[-1]['queries']
+            print(f"  {view_name:<14}"
+                  f"{statistics.median(run['build_ms'] for run in runs):>10.2f}"
+                  f"{statistics.median(run['loaded_ms'] for run in runs):>11.2f}"
+                  f"{statistics.median(run['revisit_ms'] for run in runs):>12.2f}"
+                  f"{widgets:>9}{queries:>9}")
+            if args.max_queries is not None and queries > args.max_queries:
+                over_budget.append(view_name)
+    finally:
+        app.db.set_trace_callback(None)
+        app.adb.close()
+        app.db.close()
+    if over_budget:
+        print(f"\nViews over the {args.max_queries} query budget: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
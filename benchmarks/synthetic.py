@@ -0,0 +1,114 @@
+import os
+import random
+import sqlite3
+from datetime import date, timedelta
+from preformancetracker.database import Database
+from preformancetracker.importer import prepare_record
+
+# Picking tasks with their target minutes, weighted roughly by how often they come up.
+TASKS = [
+    ('Pick Aisle A', 45, 6), ('Pick Aisle B', 45, 6), ('Pick Chilled', 30, 4),
+    ('Pick Frozen', 25, 3), ('Replenishment', 60, 2), ('Returns', 40, 1),
+    ('Loading Bay', 50, 2), ('Cycle Count', 35, 1),
+]
+DELAY_NOTES = ['Waiting for stock', 'Scanner fault', 'Blocked aisle', 'Pallet jack unavailable']
+
+# Scale name -> (days of history, number of pickers, each with their own database).
+SCALES = {
+    'week': (7, 1),
+    'year': (365, 1),
+    'five_years': (5 * 365, 1),
+    'pickers': (365, 25),
+}
+
+def _clock(minutes):
+    return f"{(minutes // 60) % 24:02d}:{minutes % 60:02d}"
+
+def generate_day(rng, work_date):
+    """Return raw import rows and the shift for one working day."""
+    shift_start = rng.choice([360, 390, 420, 840])
+    minute = shift_start
+    shift_end = shift_start + 8 * 60
+    rows = []
+    had_break = False
+    while minute < shift_end - 20:
+        name, target, _ = rng.choices(TASKS, weights=[task[2] for task in TASKS])[0]
+        # Most tasks land within about 20% of target, with the occasional bad one.
+        duration = max(10, int(rng.gauss(target, target * 0.2)))
+        row = {
+            'work_date': work_date.isoformat(),
+            'task_name': name,
+            'target_time': target,
+            'start_time': _clock(minute),
+            'skill': 'Picker',
+        }
+        if not had_break and minute - shift_start > 200:
+            row['paid_break_time'] = 15
+            row['unpaid_break_time'] = 30
+            duration += 45
+            had_break = True
+        if rng.random() < 0.15:
+            delay = rng.randint(3, 25)
+            row['delays_time'] = delay
+            row['delay_notes'] = rng.choice(DELAY_NOTES)
+            duration += delay
+        minute += duration
+        row['end_time'] = _clock(minute)
+        rows.append(row)
+        minute += rng.randint(0, 5)
+    return rows, (_clock(shift_start), _clock(minute))
+
+def generate_history(days, end=None, seed=0):
+    """Yield (records, shifts) per working day for the days up to end (default today).
+
+    Records are prepared with the same validation and metrics as an import;
+    shifts are (work_date, start_time, end_time) tuples. Sundays are days off.
+    """
+    rng = random.Random(seed)
+    end = end or date.today()
+    for offset in range(days - 1, -1, -1):
+        work_date = end - timedelta(days=offset)
+        if work_date.weekday() == 6 or rng.random() < 0.04:
+            continue
+        rows, shift = generate_day(rng, work_date)
+        yield [prepare_record(row) for row in rows], (work_date.isoformat(),) + shift
+
+def build_database(path, days, seed=0, batch_days=30):
+    """Create a database at path filled with days of synthetic history.
+
+    Returns the number of records written.
+    """
+    if os.path.exists(path):
+        os.remove(path)
+    db = Database(db_path=path, slow_query_ms=None)
+    batch, shifts, total = [], [], 0
+    try:
+        for records, shift in generate_history(days, seed=seed):
+            batch.extend(records)
+            shifts.append(shift)
+            if len(shifts) % batch_days == 0:
+                total += db.insert_records_bulk(batch)
+                batch = []
+        if batch:
+            total += db.insert_records_bulk(batch)
+    finally:
+        db.close()
+    # Shifts have no bulk API; write them directly with their historical timestamps.
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO shifts (start_time, end_time, skill, created_at) VALUES (?, ?, 'Picker', ?)",
+            [(start, end, f"{work_date} {start}:00") for work_date, start, end in shifts]
+        )
+    conn.close()
+    return total
+
+def build_scale(directory, scale, seed=0):
+    """Build the databases for a named scale and return [(path, record_count), ...]."""
+    days, pickers = SCALES[scale]
+    os.makedirs(directory, exist_ok=True)
+    return [
+        (path, build_database(path, days, seed=seed + picker))
+        for picker in range(pickers)
+        for path in [os.path.join(directory, f"{scale}-picker{picker:02d}.db")]
+    ]
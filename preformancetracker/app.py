@@ -1,22 +1,78 @@
+import time
+_IMPORT_STARTED = time.perf_counter()
+
+import asyncio
+import functools
+import importlib
 import toga
 from toga.style import Pack
 from toga.style.pack import COLUMN
 from datetime import datetime, timedelta
 import os
-from .database import Database
-from .views import home_view_new as home_view, add_record_view, records_view, stats_view, start_shift_view, finish_shift_view
+from .database import Database, AsyncDatabase
+from .metrics import calculate_metrics
+from .view_cache import ViewCache
+from .instrumentation import instrumentation
+from .views import home_view_new as home_view
 from .styles import MAIN_CONTAINER_STYLE, H1_STYLE
-from .debug import logger, get_recent_logs
+from .debug import logger
+
+# View name -> (module, creator function). Only the home view is imported up front;
+# the others are imported the first time the user navigates to them.
+VIEW_MODULES = {
+    "home": ('.views.home_view_new', 'create_home_view'),
+    "add_record": ('.views.add_record_view', 'create'),
+    "edit_record": ('.views.add_record_view', 'create'),
+    "view_records": ('.views.records_view', 'create'),
+    "statistics": ('.views.stats_view', 'create'),
+    "calendar": ('.views.calendar_view', 'create'),
+    "weekly": ('.views.weekly_view', 'create'),
+    "daily": ('.views.daily_view', 'create'),
+    "start_shift": ('.views.start_shift_view', 'create'),
+    "finish_shift": ('.views.finish_shift_view', 'create'),
+    "debug": ('.views.debug_view', 'create'),
+}
+
+# Views whose widget trees are kept between visits; forms and the debug panel are always rebuilt.
+CACHED_VIEWS = {'home', 'view_records', 'statistics', 'calendar', 'weekly', 'daily'}
+
+_IMPORT_TIME = time.perf_counter() - _IMPORT_STARTED
 
 class PerformanceTrackerApp(toga.App):
     def __init__(self, app_name, app_id):
-        super().__init__(app_name, app_id)
-        self.db = Database(self.paths)
+        # Toga may run startup() from inside App.__init__, so set up view state first.
         self.editing_record_id = None
         self.main_container = None
         self.form_widgets = {}
+        self.view_cache = ViewCache()
+        self.db = None
+        self.adb = None
+        self.api_server = None
+        self.startup_timings = {'app_import': _IMPORT_TIME}
+        super().__init__(app_name, app_id)
+        self._open_database()
         logger.info('App initialized')
 
+    def _open_database(self):
+        """Open the database unless startup() already has."""
+        if self.db is None:
+            started = time.perf_counter()
+            # PERFTRACKER_COMMIT_WINDOW_MS groups writes into shared commits;
+            # PERFTRACKER_SYNCHRONOUS=FULL syncs every commit to disk;
+            # PERFTRACKER_SLOW_QUERY_MS records statements slower than that.
+            window = os.environ.get('PERFTRACKER_COMMIT_WINDOW_MS')
+            slow_query_ms = os.environ.get('PERFTRACKER_SLOW_QUERY_MS')
+            self.db = Database(
+                self.paths,
+                slow_query_ms=float(slow_query_ms) if slow_query_ms else None,
+                commit_window_ms=float(window) if window else None,
+                synchronous=os.environ.get('PERFTRACKER_SYNCHRONOUS', 'NORMAL'),
+            )
+            if instrumentation.enabled:
+                instrumentation.instrument_database(self.db)
+            self.adb = AsyncDatabase(self.db)
+            self.startup_timings['database'] = time.perf_counter() - started
+
     def _create_header(self, title, back_handler=None):
         """Create a header with a title and optional back button."""
         header_box = toga.Box(style=Pack(direction='row', padding=10, alignment='center'))
@@ -33,74 +89,123 @@ class PerformanceTrackerApp(toga.App):
     def startup(self):
         """Initialize the application."""
         logger.info('App startup')
-        # Initialize views
-        self.views = {
-            'home': home_view.create_home_view(self),
-            'add_record': add_record_view.create(self),
-            'records': records_view.create(self),
-            'stats': stats_view.create(self),
-            'start_shift': start_shift_view.create(self),
-            'finish_shift': finish_shift_view.create(self),
-            'debug': self.create_debug_view()
-        }
-        
-        # Set initial view
+        started = time.perf_counter()
+        self._open_database()
+
+        # Set initial view; other views are imported and built on first visit
+        window_started = time.perf_counter()
         self.main_window = toga.MainWindow(title=self.formal_name)
         self.main_container = toga.Box(style=MAIN_CONTAINER_STYLE)
+        view_started = time.perf_counter()
         self.set_view("home")
+        self.startup_timings['home_view'] = time.perf_counter() - view_started
         self.main_window.content = self.main_container
         self.main_window.show()
+        self._start_api_server()
+        self.startup_timings['window'] = time.perf_counter() - window_started - self.startup_timings['home_view']
+        self.startup_timings['startup_total'] = time.perf_counter() - started
+        logger.info('Startup timings: ' + ', '.join(
+            f"{name}={seconds * 1000:.1f}ms" for name, seconds in self.startup_timings.items()
+        ))
+
+    def _start_api_server(self):
+        """Serve the stats API on loopback when PERFTRACKER_API_PORT is set."""
+        port = os.environ.get('PERFTRACKER_API_PORT')
+        if not port:
+            return
+        from .stats_server import StatsServer
+        self.api_server = StatsServer(self.adb, port=int(port))
+        self.loop.create_task(self.api_server.start())
+
+    def on_exit(self):
+        """Commit queued writes and release database connections before the app exits."""
+        logger.info('App exiting')
+        if self.api_server is not None:
+            self.api_server.close()
+        self.adb.close()
+        self.db.close()
+        return True
 
     def set_view(self, view_name, **kwargs):
-        """Switch to a different view."""
+        """Switch to a different view, reusing its cached widgets when possible."""
         logger.info(f'Switching to view: {view_name}')
+        if not instrumentation.enabled:
+            self._show_view(view_name, **kwargs)
+            return
+        # build is the synchronous widget work; query is the time the loads the
+        # view schedules on the event loop take to finish after that, and total
+        # covers both.
+        started = time.perf_counter()
+        pending = asyncio.all_tasks(self.loop)
+        try:
+            self._show_view(view_name, **kwargs)
+        finally:
+            build = time.perf_counter() - started
+            instrumentation.record(f"view.{view_name}.build", build)
+            loads = asyncio.all_tasks(self.loop) - pending
+            if loads:
+                self.loop.create_task(self._record_view_loads(view_name, started, build, loads))
+            else:
+                instrumentation.record(f"view.{view_name}.total", build)
+
+    async def _record_view_loads(self, view_name, started, build, loads):
+        """Record how long the loads scheduled by a view switch took to finish."""
+        await asyncio.wait(loads)
+        total = time.perf_counter() - started
+        instrumentation.record(f"view.{view_name}.query", total - build)
+        instrumentation.record(f"view.{view_name}.total", total)
+
+    def _show_view(self, view_name, **kwargs):
+        """Replace the main container's content with the named view."""
         self.main_container.clear()
-        view_creators = {
-            "home": home_view.create_home_view,
-            "add_record": add_record_view.create,
-            "edit_record": add_record_view.create,
-            "view_records": records_view.create,
-            "statistics": stats_view.create,
-            "start_shift": start_shift_view.create,
-            "finish_shift": finish_shift_view.create,
-            "debug": self.create_debug_view,
-        }
-        creator = view_creators.get(view_name, home_view.create_home_view)
-        view_content = creator(self, **kwargs) if view_name != 'debug' else creator()
+        module = self._load_view_module(view_name)
+        view_content = self.view_cache.get(view_name, kwargs) if view_name in CACHED_VIEWS else None
+        if view_content is not None:
+            refresh = getattr(module, 'refresh', None)
+            if refresh:
+                refresh(self, view_content)
+            self.main_container.add(view_content)
+            return
+        _, creator_name = VIEW_MODULES.get(view_name, VIEW_MODULES['home'])
+        view_content = getattr(module, creator_name)(self, **kwargs)
+        if view_name in CACHED_VIEWS:
+            self.view_cache.put(view_name, kwargs, view_content)
         self.main_container.add(view_content)
 
-    def create_debug_view(self):
-        box = toga.Box(style=Pack(direction=COLUMN, padding=20))
-        box.add(toga.Label('Debug Panel', style=Pack(font_size=20, font_weight='bold', padding_bottom=10)))
-        logs = get_recent_logs(50)
-        for ts, msg in logs:
-            box.add(toga.Label(f"{ts.strftime('%H:%M:%S')} {msg}", style=Pack(font_size=12)))
-        back_button = toga.Button('Back to Home', on_press=lambda w: self.set_view('home'))
-        box.add(back_button)
-        return box
+    def _load_view_module(self, view_name):
+        """Import the module behind a view, timing the first import."""
+        module_name, _ = VIEW_MODULES.get(view_name, VIEW_MODULES['home'])
+        started = time.perf_counter()
+        module = importlib.import_module(module_name, __package__)
+        elapsed = time.perf_counter() - started
+        if elapsed > 0.001:
+            logger.debug(f"Imported {module_name} in {elapsed * 1000:.1f}ms")
+        return module
+
+    def invalidate_views(self, view_name=None):
+        """Discard cached views so they are rebuilt on their next visit."""
+        self.view_cache.invalidate(view_name)
 
     async def save_record_async(self):
         """Save a performance record asynchronously."""
         try:
             logger.info('Saving record...')
             fw = self.form_widgets
-            start_dt = datetime.strptime(fw['start_input'].value, '%H:%M')
-            finish_dt = datetime.strptime(fw['finish_input'].value, '%H:%M')
-            if finish_dt < start_dt: finish_dt += timedelta(days=1)
-            total_elapsed = (finish_dt - start_dt).total_seconds() / 60
-            total_break = float(fw['paid_break_input'].value) + float(fw['unpaid_break_input'].value) if fw['break_checkbox'].value else 0
-            delays = float(fw['delays_input'].value) if fw['delays_checkbox'].value else 0
-            actual_work = max(0, total_elapsed - total_break)
-            effective_time = max(1, actual_work - delays)
-            performance = (float(fw['target_input'].value) / effective_time) * 100
+            metrics = calculate_metrics(
+                fw['start_input'].value, fw['finish_input'].value, fw['target_input'].value,
+                paid_break_time=fw['paid_break_input'].value, unpaid_break_time=fw['unpaid_break_input'].value,
+                has_break=fw['break_checkbox'].value,
+                delays_time=fw['delays_input'].value, has_delays=fw['delays_checkbox'].value
+            )
             record_data = {
                 'task_name': fw['task_display'].text, 'target_time': float(fw['target_input'].value),
-                'actual_time': actual_work, 'performance_percentage': performance, 'start_time': fw['start_input'].value, 
-                'end_time': fw['finish_input'].value, 'break_time': total_break, 'has_break': fw['break_checkbox'].value,
-                'delays_time': delays, 'has_delays': fw['delays_checkbox'].value, 'delay_notes': fw['delays_notes_input'].value,
+                'actual_time': metrics['actual_time'], 'performance_percentage': metrics['performance_percentage'], 'start_time': fw['start_input'].value, 
+                'end_time': fw['finish_input'].value, 'break_time': metrics['break_time'], 'has_break': fw['break_checkbox'].value,
+                'delays_time': metrics['delays_time'], 'has_delays': fw['delays_checkbox'].value, 'delay_notes': fw['delays_notes_input'].value,
                 'skill': "Picker", 'paid_break_time': float(fw['paid_break_input'].value), 'unpaid_break_time': float(fw['unpaid_break_input'].value)
             }
-            self.db.save_record(record_data, self.editing_record_id)
+            with instrumentation.span('handler.save_record'):
+                await self.adb.durable(await self.adb.save_record(record_data, self.editing_record_id))
             await self.main_window.info_dialog("Success", f"Record {'updated' if self.editing_record_id else 'saved'}!")
             self.set_view('view_records')
         except Exception as e:
@@ -110,15 +215,42 @@ class PerformanceTrackerApp(toga.App):
     async def delete_record_async(self, record_id):
         """Delete a performance record asynchronously."""
         if await self.main_window.confirm_dialog("Delete Record?", "This cannot be undone."):
-            self.db.delete_record(record_id)
+            with instrumentation.span('handler.delete_record'):
+                await self.adb.durable(await self.adb.delete_record(record_id))
             self.set_view('view_records')
 
+    async def export_records_async(self, status_label=None):
+        """Export all records to a CSV file in the background."""
+        export_dir = os.path.join(self.paths.data, 'exports')
+        os.makedirs(export_dir, exist_ok=True)
+        path = os.path.join(export_dir, f"records-{datetime.now().strftime('%Y%m%d-%H%M%S')}.csv")
+        loop = asyncio.get_running_loop()
+
+        def report(written, total):
+            if status_label is not None:
+                loop.call_soon_threadsafe(setattr, status_label, 'text', f"Exporting... {written}/{total} records")
+
+        from .export import export_records
+
+        try:
+            with instrumentation.span('handler.export_records'):
+                written = await loop.run_in_executor(None, functools.partial(export_records, self.db, path, progress=report))
+            if status_label is not None:
+                status_label.text = f"Exported {written} records"
+            await self.main_window.info_dialog("Export Complete", f"Exported {written} records to {path}")
+        except Exception as e:
+            logger.exception('Error exporting records: %s', e)
+            if status_label is not None:
+                status_label.text = "Export failed"
+            await self.main_window.error_dialog("Export Error", f"Could not export records: {e}")
+
     async def start_shift_async(self):
         """Start a new shift asynchronously."""
         try:
             start_time = self.form_widgets['shift_start_input'].value.strip()
             datetime.strptime(start_time, '%H:%M')
-            self.db.start_shift(start_time, "Picker")
+            with instrumentation.span('handler.start_shift'):
+                await self.adb.durable(await self.adb.start_shift(start_time, "Picker"))
             await self.main_window.info_dialog("Shift Started", f"Your shift has officially started at {start_time}.")
             self.set_view("home")
         except Exception as e: await self.main_window.error_dialog("Error", f"Could not start shift: {e}")
@@ -129,7 +261,8 @@ class PerformanceTrackerApp(toga.App):
             finish_time = self.form_widgets['finish_time_input'].value.strip()
             datetime.strptime(finish_time, '%H:%M')
             if await self.main_window.confirm_dialog("Finish Shift?", "You cannot add more records today after finishing."):
-                self.db.finish_shift(finish_time)
+                with instrumentation.span('handler.finish_shift'):
+                    await self.adb.durable(await self.adb.finish_shift(finish_time))
                 await self.main_window.info_dialog("Shift Ended", "Your shift has been recorded. Great work!")
                 self.set_view("home")
         except Exception as e: await self.main_window.error_dialog("Error", f"Could not finish shift: {e}")
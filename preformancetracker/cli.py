@@ -0,0 +1,184 @@
+import argparse
+import asyncio
+import json
+import sys
+from datetime import date, timedelta
+from .database import AsyncDatabase, Database
+from .export import EXPORT_FORMATS, export_records
+from .importer import import_records, read_records_file
+from .metrics import recompute_metrics
+from .site_report import SITE_GRANULARITIES, build_site_report
+from .stats_server import DEFAULT_HOST, DEFAULT_MAX_CONCURRENCY, DEFAULT_PORT, StatsServer
+
+def rebuild_rollups(args):
+    """Rebuild the daily rollup table from the raw performance records."""
+    db = Database(db_path=args.db)
+    try:
+        days = db.rebuild_rollups()
+        print(f"Rebuilt daily rollups for {days} day(s)")
+    finally:
+        db.close()
+    return 0
+
+def export(args):
+    """Stream records to a CSV or JSON lines file."""
+    db = Database(db_path=args.db)
+
+    def report(written, total):
+        print(f"\rExported {written}/{total} records", end='', file=sys.stderr, flush=True)
+
+    try:
+        written = export_records(
+            db, args.output, fmt=args.format, start_date=args.start, end_date=args.end,
+            progress=None if args.quiet else report
+        )
+    finally:
+        db.close()
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(f"Wrote {written} record(s) to {args.output}")
+    return 0
+
+def import_file(args):
+    """Import historical records from a CSV, JSON or JSON lines file."""
+    db = Database(db_path=args.db)
+    try:
+        result = import_records(db, read_records_file(args.input))
+    finally:
+        db.close()
+    for row_number, message in result['errors']:
+        print(f"Row {row_number}: {message}", file=sys.stderr)
+    print(f"Imported {result['inserted']} record(s), skipped {len(result['errors'])}")
+    return 1 if result['errors'] else 0
+
+def recompute(args):
+    """Recompute stored metrics for every record with the current formula."""
+    db = Database(db_path=args.db)
+
+    def report(checked, changed):
+        print(f"\rChecked {checked} records, {changed} changed", end='', file=sys.stderr, flush=True)
+
+    try:
+        checked, changed = recompute_metrics(
+            db, chunk_size=args.chunk_size, dry_run=args.dry_run,
+            progress=None if args.quiet else report, battery_credit=args.battery_credit
+        )
+    finally:
+        db.close()
+    if not args.quiet:
+        print(file=sys.stderr)
+    action = 'would change' if args.dry_run else 'updated'
+    print(f"Checked {checked} record(s), {action} {changed}")
+    return 0
+
+def site_report(args):
+    """Aggregate a directory of worker databases into per-worker and site-wide stats."""
+    end = args.end or date.today().isoformat()
+    start = args.start or (date.fromisoformat(end) - timedelta(days=27)).isoformat()
+    report = build_site_report(
+        args.directory, start, end, granularity=args.granularity, processes=args.processes
+    )
+
+    def line(name, stats):
+        median = stats['median_performance']
+        return (f"  {name:<24}{stats['total_records']:>9}{stats['avg_performance']:>9.1f}"
+                f"{median if median is not None else 0:>9.1f}{stats['p90_performance'] or 0:>9.1f}")
+
+    header = f"  {'':<24}{'records':>9}{'avg %':>9}{'median':>9}{'p90':>9}"
+    print(f"Site report {start} to {end}: {len(report['workers'])} worker(s)")
+    print(f"\nBy worker\n{header}")
+    for worker, stats in sorted(report['workers'].items()):
+        print(line(worker, stats))
+    print(f"\nSite by {args.granularity}\n{header}")
+    for period, stats in report['periods'].items():
+        print(line(period, stats))
+    print(line('Site total', report['total']))
+    for worker, error in sorted(report['failed'].items()):
+        print(f"Skipped {worker}: {error}", file=sys.stderr)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(dict(report, start=start, end=end, granularity=args.granularity), f, indent=2)
+        print(f"\nWrote report to {args.json}")
+    return 1 if report['failed'] else 0
+
+def serve(args):
+    """Serve the read-only stats API until interrupted."""
+    db = Database(db_path=args.db)
+    adb = AsyncDatabase(db)
+    server = StatsServer(adb, host=args.host, port=args.port, max_concurrency=args.max_concurrency)
+
+    async def run():
+        await server.start()
+        print(f"Serving stats for {args.db} on http://{server.host}:{server.port} (Ctrl+C to stop)")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        adb.close()
+        db.close()
+    return 0
+
+def build_parser():
+    """Build the command line parser."""
+    parser = argparse.ArgumentParser(
+        prog='python -m preformancetracker.cli',
+        description='Maintenance commands for the Performance Tracker database.'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    rebuild = subparsers.add_parser('rebuild-rollups', help='Recompute the daily_rollups summary table')
+    rebuild.add_argument('--db', required=True, help='Path to performance.db')
+    rebuild.set_defaults(handler=rebuild_rollups)
+
+    export_parser = subparsers.add_parser('export', help='Export records to CSV or JSON lines')
+    export_parser.add_argument('output', help='File to write')
+    export_parser.add_argument('--db', required=True, help='Path to performance.db')
+    export_parser.add_argument('--format', choices=EXPORT_FORMATS, default='csv')
+    export_parser.add_argument('--start', help='First work date to include (YYYY-MM-DD)')
+    export_parser.add_argument('--end', help='Last work date to include (YYYY-MM-DD)')
+    export_parser.add_argument('--quiet', action='store_true', help='Do not report progress')
+    export_parser.set_defaults(handler=export)
+
+    import_parser = subparsers.add_parser('import', help='Import records from CSV, JSON or JSON lines')
+    import_parser.add_argument('input', help='File to read (.csv, .json or .jsonl)')
+    import_parser.add_argument('--db', required=True, help='Path to performance.db')
+    import_parser.set_defaults(handler=import_file)
+
+    recompute_parser = subparsers.add_parser('recompute', help='Recompute performance metrics for all records')
+    recompute_parser.add_argument('--db', required=True, help='Path to performance.db')
+    recompute_parser.add_argument('--chunk-size', type=int, default=1000, help='Records per transaction')
+    recompute_parser.add_argument('--dry-run', action='store_true', help='Count changes without writing them')
+    recompute_parser.add_argument('--battery-credit', action='store_true',
+                                  help='Also take battery change time off the worked time (changes the formula)')
+    recompute_parser.add_argument('--quiet', action='store_true', help='Do not report progress')
+    recompute_parser.set_defaults(handler=recompute)
+
+    site_parser = subparsers.add_parser('site-report', help='Aggregate a directory of worker databases')
+    site_parser.add_argument('directory', help='Directory holding one .db file per worker')
+    site_parser.add_argument('--start', help='First work date to include (default: 27 days before --end)')
+    site_parser.add_argument('--end', help='Last work date to include (default: today)')
+    site_parser.add_argument('--granularity', choices=SITE_GRANULARITIES, default='day')
+    site_parser.add_argument('--processes', type=int, help='Worker processes (default: one per CPU)')
+    site_parser.add_argument('--json', metavar='PATH', help='Also write the full report as JSON')
+    site_parser.set_defaults(handler=site_report)
+
+    serve_parser = subparsers.add_parser('serve', help='Serve stats as JSON over HTTP')
+    serve_parser.add_argument('--db', required=True, help='Path to performance.db')
+    serve_parser.add_argument('--host', default=DEFAULT_HOST,
+                              help='Address to listen on (default: %(default)s, this machine only)')
+    serve_parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Port (default: %(default)s)')
+    serve_parser.add_argument('--max-concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY,
+                              help='Requests allowed to query the database at once (default: %(default)s)')
+    serve_parser.set_defaults(handler=serve)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
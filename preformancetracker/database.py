@@ -1,24 +1,559 @@
 import sqlite3
 import os
+import asyncio
+import copy
+import functools
+import queue
+import threading
+import time
+from pathlib import Path
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from contextlib import contextmanager
 from .debug import logger
+from .metrics import battery_changes_time
+from .quantiles import MAX_BUCKET, QuantileSketch
+from .slow_queries import SlowQueryLog, TimedConnection
+
+MIGRATION_BATCH_SIZE = 1000
+
+ROLLUP_COLUMNS = '''
+    work_date, record_count, sum_actual_time, sum_break_time,
+    sum_delays_time, sum_performance, min_performance, max_performance
+'''
+
+# Aggregates performance_records rows into daily_rollups rows; callers add the WHERE clause.
+ROLLUP_SELECT = '''
+    SELECT work_date, COUNT(*), COALESCE(SUM(actual_time), 0), COALESCE(SUM(break_time), 0),
+           COALESCE(SUM(delays_time), 0), COALESCE(SUM(performance_percentage), 0),
+           MIN(performance_percentage), MAX(performance_percentage)
+    FROM performance_records
+'''
+
+def _date_key(value):
+    """Normalise a date, datetime or 'YYYY-MM-DD' string to a work_date key."""
+    if isinstance(value, str):
+        return value[:10]
+    return value.strftime('%Y-%m-%d')
+
+def _today_key():
+    """Return today's local work_date key."""
+    return datetime.now().strftime('%Y-%m-%d')
+
+# SQL expressions mapping work_date to the first day of its bucket.
+BUCKET_EXPRESSIONS = {
+    'day': "work_date",
+    'week': "date(work_date, '-' || ((CAST(strftime('%w', work_date) AS INTEGER) + 6) % 7) || ' days')",
+    'month': "strftime('%Y-%m-01', work_date)",
+}
+
+# Rolling trend windows, in calendar days.
+TREND_WINDOWS = (7, 30, 90)
+
+def combine_stats(buckets):
+    """Combine grouped stats buckets into a single stats dict for the whole range."""
+    buckets = list(buckets)
+    total_records = sum(b['total_records'] for b in buckets)
+    sum_performance = sum(b['sum_performance'] for b in buckets)
+    return {
+        'avg_performance': sum_performance / total_records if total_records else 0,
+        'total_records': total_records,
+        'total_time': sum(b['total_time'] for b in buckets),
+        'total_break_time': sum(b['total_break_time'] for b in buckets),
+        'total_delay_time': sum(b['total_delay_time'] for b in buckets),
+        'active_days': sum(b['active_days'] for b in buckets),
+        'best_performance': max((b['best_performance'] for b in buckets), default=0),
+        'worst_performance': min((b['worst_performance'] for b in buckets), default=0),
+        'sum_performance': sum_performance,
+    }
+
+def _bucket_sql(column):
+    """SQL for the histogram bin of a performance column; matches quantiles.performance_bucket."""
+    return f"MIN(MAX(CAST({column} AS INTEGER), 0), {MAX_BUCKET})"
+
+def _histogram_add(row, task_column):
+    """Trigger statement counting the NEW or OLD record into its histogram bin."""
+    return f'''
+        INSERT INTO performance_histogram (work_date, {task_column}, bucket, count, min_value, max_value)
+        VALUES ({row}.work_date, {row}.{task_column}, {_bucket_sql(f'{row}.performance_percentage')}, 1,
+                {row}.performance_percentage, {row}.performance_percentage)
+        ON CONFLICT(work_date, {task_column}, bucket) DO UPDATE SET
+            count = count + 1,
+            min_value = MIN(min_value, excluded.min_value),
+            max_value = MAX(max_value, excluded.max_value);
+    '''
+
+def _histogram_remove(row, task_column):
+    """Trigger statements taking the NEW or OLD record out of its histogram bin."""
+    match = (
+        f"work_date = {row}.work_date AND {task_column} = {row}.{task_column} "
+        f"AND bucket = {_bucket_sql(f'{row}.performance_percentage')}"
+    )
+    # Rows still in the bin after the change; the trigger runs once the record is gone or moved.
+    remaining = (
+        f"FROM performance_records r WHERE r.work_date = {row}.work_date "
+        f"AND r.{task_column} = {row}.{task_column} "
+        f"AND {_bucket_sql('r.performance_percentage')} = performance_histogram.bucket"
+    )
+    return f'''
+        UPDATE performance_histogram SET count = count - 1 WHERE {match};
+        DELETE FROM performance_histogram WHERE {match} AND count <= 0;
+        UPDATE performance_histogram SET
+            min_value = (SELECT MIN(r.performance_percentage) {remaining}),
+            max_value = (SELECT MAX(r.performance_percentage) {remaining})
+        WHERE {match} AND {row}.performance_percentage IN (min_value, max_value);
+    '''
+
+def _search_index_row(row, command=None):
+    """Trigger statement indexing a record in record_search, or with command='delete' unindexing it."""
+    if command:
+        columns, values = 'record_search, rowid', f"'{command}', {row}.id"
+    else:
+        columns, values = 'rowid', f"{row}.id"
+    return f'''
+        INSERT INTO record_search ({columns}, task_name, delay_notes)
+        VALUES ({values}, (SELECT name FROM tasks WHERE id = {row}.task_id), {row}.delay_notes);
+    '''
+
+def search_match_query(text):
+    """Turn what the user typed into an FTS5 MATCH expression, or None if there is nothing to search for.
+
+    Every word must appear; the last one also matches as a prefix so results
+    update while the user is still typing. Words are quoted, so FTS5 syntax
+    characters in the input are searched for literally.
+    """
+    words = [word.replace('"', '') for word in text.split()]
+    words = [word for word in words if word]
+    if not words:
+        return None
+    return ' '.join(f'"{word}"' for word in words) + '*'
+
+def _day_range(date=None):
+    """Cache range for a single-day stats call."""
+    day = _date_key(date or datetime.now())
+    return day, day, ()
+
+def _week_range(week_start=None):
+    """Cache range for a seven-day stats call."""
+    if week_start is None:
+        week_start = datetime.now()
+    elif isinstance(week_start, str):
+        week_start = datetime.strptime(week_start[:10], '%Y-%m-%d')
+    return _date_key(week_start), _date_key(week_start + timedelta(days=6)), ()
+
+def _span_range(start_date, end_date, *args, **kwargs):
+    """Cache range for an explicit start/end stats call."""
+    return _date_key(start_date), _date_key(end_date), (args, tuple(sorted(kwargs.items())))
+
+def _trend_range(start_date, end_date, windows=TREND_WINDOWS):
+    """Cache range for a trends call, including the days its longest window looks back over."""
+    warmup = timedelta(days=max(windows) - 1)
+    start = datetime.strptime(_date_key(start_date), '%Y-%m-%d') - warmup
+    return _date_key(start), _date_key(end_date), (tuple(windows),)
+
+class StatsCache:
+    """Bounded LRU cache of stats results, invalidated by the work dates they cover.
+
+    version counts invalidations, so it changes whenever the data behind any
+    cached result may have changed.
+    """
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.version = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """Return (True, value) for a cached key, or (False, None) on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, copy.deepcopy(entry[2])
+
+    def put(self, key, start, end, value, version=None):
+        """Store a result covering the work dates start..end (inclusive).
+
+        version is the cache version read before the result was computed; if
+        a write has invalidated the cache since, the result may predate it
+        and is not stored.
+        """
+        with self._lock:
+            if version is not None and version != self.version:
+                return
+            self._entries[key] = (start, end, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, dates):
+        """Drop every cached result whose range contains one of the given work dates."""
+        dates = [d for d in dates if d]
+        with self._lock:
+            self.version += 1
+            stale = [
+                key for key, (start, end, _) in self._entries.items()
+                if any(start <= d <= end for d in dates)
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        """Drop every cached result."""
+        with self._lock:
+            self.version += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def info(self):
+        """Return cache counters for diagnostics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0,
+                'entries': len(self._entries),
+                'maxsize': self.maxsize,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+def cached_stats(date_range):
+    """Cache a Database stats method under the work-date range its arguments cover."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            start, end, extra = date_range(*args, **kwargs)
+            key = (method.__name__, start, end, extra)
+            version = self.stats_cache.version
+            found, value = self.stats_cache.get(key)
+            if found:
+                return value
+            value = method(self, *args, **kwargs)
+            self.stats_cache.put(key, start, end, value, version)
+            return value
+        return wrapper
+    return decorator
+
+class ConnectionManager:
+    """Keeps one long-lived SQLite connection per thread for a database file."""
+    def __init__(self, db_path, busy_timeout=5000, cached_statements=256, slow_queries=None, synchronous='NORMAL',
+                 read_only=False):
+        self.db_path = db_path
+        self.read_only = read_only
+        self.synchronous = synchronous
+        self.slow_queries = slow_queries
+        self.busy_timeout = busy_timeout
+        self.cached_statements = cached_statements
+        self._trace_callback = None
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self):
+        """Open and configure a new connection."""
+        # Connections are only ever used by the thread that opened them, but
+        # close_all() may run on another thread at shutdown.
+        target = self.db_path
+        if self.read_only:
+            # mode=ro fails on a missing file instead of creating it and rejects every write.
+            target = Path(os.path.abspath(self.db_path)).as_uri() + '?mode=ro'
+        conn = sqlite3.connect(
+            target,
+            uri=self.read_only,
+            timeout=self.busy_timeout / 1000,
+            cached_statements=self.cached_statements,
+            check_same_thread=False,
+            factory=TimedConnection if self.slow_queries is not None else sqlite3.Connection
+        )
+        if self.slow_queries is not None:
+            conn.slow_queries = self.slow_queries
+        conn.execute(f'PRAGMA busy_timeout = {int(self.busy_timeout)}')
+        if not self.read_only:
+            conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute(f'PRAGMA synchronous = {self.synchronous}')
+        conn.execute('PRAGMA foreign_keys = ON')
+        if self._trace_callback is not None:
+            conn.set_trace_callback(self._trace_callback)
+        return conn
+
+    def get(self):
+        """Return the calling thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            return conn
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError('Connection manager has been closed')
+            conn = self._connect()
+            self._connections.append(conn)
+        self._local.conn = conn
+        logger.debug(f"Opened database connection for thread {threading.current_thread().name}")
+        return conn
+
+    def set_trace_callback(self, callback):
+        """Install a sqlite3 trace callback on every open and future connection; None removes it."""
+        with self._lock:
+            self._trace_callback = callback
+            for conn in self._connections:
+                conn.set_trace_callback(callback)
+
+    def close_all(self):
+        """Close every connection opened by this manager."""
+        with self._lock:
+            self._closed = True
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Error closing database connection: {e}")
+        self._local = threading.local()
+        logger.info(f"Closed {len(connections)} database connection(s)")
+
+class AsyncDatabase:
+    """Awaitable facade that runs Database calls on a dedicated worker thread.
+
+    Every method of the wrapped Database is available under the same name and
+    returns an awaitable instead of blocking the caller's event loop. Calls run
+    one at a time, in the order they were made.
+    """
+    def __init__(self, db):
+        self.db = db
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='db-worker')
+
+    def run(self, func, *args, **kwargs):
+        """Run func(*args, **kwargs) on the worker thread and return an awaitable."""
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def __getattr__(self, name):
+        attr = getattr(self.db, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def call(*args, **kwargs):
+            return self.run(attr, *args, **kwargs)
+        return call
+
+    async def durable(self, handle):
+        """Wait, without blocking the event loop, until a write handle is committed."""
+        return await asyncio.wrap_future(handle)
+
+    def close(self):
+        """Wait for queued calls to finish and stop the worker thread."""
+        self._executor.shutdown(wait=True)
+
+SYNCHRONOUS_LEVELS = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+class WriteQueue:
+    """Write-behind queue that groups writes into shared transactions.
+
+    Writes submitted within commit_window seconds of the first one in a batch
+    (up to max_batch of them) run on a dedicated writer thread inside a single
+    transaction, so a burst of user actions costs one commit and one fsync.
+    Each write runs in its own savepoint, so a failing write is rolled back
+    and reported without affecting the rest of its batch.
+
+    submit() returns a concurrent.futures.Future that completes once the
+    write's transaction has committed (or fails with the write's error).
+    """
+    def __init__(self, db, commit_window=0.05, max_batch=100):
+        self.db = db
+        self.commit_window = commit_window
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, write, urgent=False):
+        """Queue write(conn), which returns the work dates it changed; returns its handle."""
+        if self._closed:
+            raise sqlite3.ProgrammingError('Write queue has been closed')
+        handle = Future()
+        self._queue.put((write, handle, urgent))
+        return handle
+
+    def flush(self, timeout=None):
+        """Commit everything queued so far without waiting for the window, and wait for it."""
+        self.submit(lambda conn: [], urgent=True).result(timeout)
+
+    def close(self):
+        """Flush pending writes and stop the writer thread."""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.commit_window
+            while not batch[-1][2] and len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    # close() always flushes first, so nothing follows the sentinel.
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+            self._commit(batch)
+
+    def _commit(self, batch):
+        """Run a batch of writes in one transaction and complete their handles after the commit."""
+        outcomes = []
+        dates = set()
+        try:
+            with self.db._get_connection() as conn:
+                conn.execute('BEGIN')
+                for write, handle, _ in batch:
+                    conn.execute('SAVEPOINT queued_write')
+                    try:
+                        dates.update(write(conn) or [])
+                    except Exception as e:
+                        conn.execute('ROLLBACK TO queued_write')
+                        # Tasks created by the rolled back write no longer exist.
+                        self.db._task_ids.clear()
+                        outcomes.append((handle, e))
+                    else:
+                        outcomes.append((handle, None))
+                    conn.execute('RELEASE queued_write')
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Group commit of {len(batch)} write(s) failed: {e}")
+            for _, handle, _ in batch:
+                handle.set_exception(e)
+            return
+        self.db.stats_cache.invalidate(sorted(d for d in dates if d))
+        for handle, error in outcomes:
+            if error is None:
+                handle.set_result(None)
+            else:
+                handle.set_exception(error)
+        if len(batch) > 1:
+            logger.debug(f"Group committed {len(batch)} write(s)")
 
 class Database:
     """Handles all SQLite database operations for Performance Tracker."""
-    def __init__(self, paths):
-        self.db_path = os.path.join(paths.data, 'performance.db')
-        self._ensure_db_exists()
+    # Applied in order; PRAGMA user_version counts how many a database has had.
+    MIGRATIONS = (
+        '_migrate_work_date',
+        '_migrate_daily_rollups',
+        '_migrate_created_at_index',
+        '_migrate_performance_histogram',
+        '_migrate_tasks',
+        '_migrate_record_search',
+        '_migrate_histogram_bounds',
+    )
+
+    def __init__(self, paths=None, db_path=None, slow_query_ms=None, slow_query_path=None,
+                 commit_window_ms=None, synchronous='NORMAL', max_batch=100, read_only=False):
+        """Open the database. With slow_query_ms set, statements slower than
+        that are kept in self.slow_queries (and appended to slow_query_path if
+        given); the recorder times every statement in Python, so it is off by
+        default and self.slow_queries is None.
+
+        With commit_window_ms set, writes go through a WriteQueue that commits
+        everything issued within that many milliseconds in one transaction;
+        by default each write commits on its own. synchronous is the SQLite
+        synchronous level: NORMAL may lose the last commits on power loss
+        (never on an app crash), FULL syncs every commit to disk.
+
+        read_only opens an existing database for reading without creating,
+        migrating or writing it, and raises sqlite3.DatabaseError if its
+        schema is missing or older than the current version."""
+        synchronous = synchronous.upper()
+        if synchronous not in SYNCHRONOUS_LEVELS:
+            raise ValueError(f"synchronous must be one of {', '.join(SYNCHRONOUS_LEVELS)}, not {synchronous!r}")
+        self.db_path = db_path or os.path.join(paths.data, 'performance.db')
+        self.slow_queries = SlowQueryLog(slow_query_ms, path=slow_query_path) if slow_query_ms is not None else None
+        self._connections = ConnectionManager(
+            self.db_path, slow_queries=self.slow_queries, synchronous=synchronous, read_only=read_only
+        )
+        self.stats_cache = StatsCache()
+        # (task name, target time) -> tasks.id, filled as tasks are looked up or created.
+        self._task_ids = {}
+        # Thread id -> last PRAGMA data_version seen by sync_external_writes().
+        self._seen_data_versions = {}
+        if read_only:
+            try:
+                self._check_schema()
+            except Exception:
+                self._connections.close_all()
+                raise
+        else:
+            self._ensure_db_exists()
+        self.write_queue = None
+        if commit_window_ms is not None:
+            self.write_queue = WriteQueue(self, commit_window_ms / 1000, max_batch)
         logger.info('Database initialized')
 
+    def close(self):
+        """Commit any queued writes and close all open database connections."""
+        if self.write_queue is not None:
+            self.write_queue.close()
+        self._connections.close_all()
+
+    def set_trace_callback(self, callback):
+        """Call callback(sql) for every statement run on this database's connections."""
+        self._connections.set_trace_callback(callback)
+
+    @property
+    def data_version(self):
+        """Counter that changes after every write made through this Database."""
+        return self.stats_cache.version
+
+    def sync_external_writes(self):
+        """Drop cached stats if another connection or process has committed since the last check.
+
+        Writes made through this thread's connection are already invalidated
+        precisely; this catches the ones the stats cache cannot see, such as
+        another process writing the same file. Returns True if anything changed.
+        """
+        with self._get_connection() as conn:
+            version = conn.execute('PRAGMA data_version').fetchone()[0]
+        thread = threading.get_ident()
+        changed = self._seen_data_versions.get(thread, version) != version
+        self._seen_data_versions[thread] = version
+        if changed:
+            self.stats_cache.clear()
+        return changed
+
     @contextmanager
     def _get_connection(self):
-        """Get a database connection using a context manager."""
-        conn = sqlite3.connect(self.db_path)
+        """Get the shared connection for this thread using a context manager."""
+        conn = self._connections.get()
         try:
             yield conn
-        finally:
-            conn.close()
+        except Exception:
+            conn.rollback()
+            # Tasks created in the rolled back transaction no longer exist.
+            self._task_ids.clear()
+            raise
 
     def _ensure_db_exists(self):
         """Ensure the database and its tables exist."""
@@ -54,97 +589,637 @@ class Database:
                 )
             ''')
             conn.commit()
+            self._apply_migrations(conn)
+
+    def _check_schema(self):
+        """Raise sqlite3.DatabaseError unless the database has every migration applied."""
+        with self._get_connection() as conn:
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            tables = conn.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'performance_records'"
+            ).fetchone()[0]
+        if not tables:
+            raise sqlite3.DatabaseError('not a Performance Tracker database')
+        if version < len(self.MIGRATIONS):
+            raise sqlite3.DatabaseError(
+                f"schema version {version} is older than {len(self.MIGRATIONS)}; open it in the app to upgrade it"
+            )
+
+    def _apply_migrations(self, conn):
+        """Bring an existing database up to the current schema version."""
+        migrations = [getattr(self, name) for name in self.MIGRATIONS]
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        for number, migration in enumerate(migrations[version:], start=version + 1):
+            logger.info(f"Applying database migration {number}: {migration.__name__}")
+            migration(conn)
+            conn.execute(f'PRAGMA user_version = {number}')
+            conn.commit()
+
+    def _migrate_work_date(self, conn, batch_size=MIGRATION_BATCH_SIZE):
+        """Add the indexed local work_date column and backfill it in batches."""
+        columns = [row[1] for row in conn.execute('PRAGMA table_info(performance_records)')]
+        if 'work_date' not in columns:
+            conn.execute('ALTER TABLE performance_records ADD COLUMN work_date TEXT')
+            conn.commit()
+        # created_at is stored in UTC; bucket existing rows by the device's local day.
+        while True:
+            cursor = conn.execute('''
+                UPDATE performance_records
+                SET work_date = date(created_at, 'localtime')
+                WHERE id IN (
+                    SELECT id FROM performance_records WHERE work_date IS NULL LIMIT ?
+                )
+            ''', (batch_size,))
+            conn.commit()
+            if cursor.rowcount < batch_size:
+                break
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_performance_records_work_date
+            ON performance_records (work_date, created_at)
+        ''')
+
+    def _migrate_daily_rollups(self, conn):
+        """Add the daily_rollups summary table, its maintenance triggers and initial data."""
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS daily_rollups (
+                work_date TEXT PRIMARY KEY,
+                record_count INTEGER NOT NULL DEFAULT 0,
+                sum_actual_time REAL NOT NULL DEFAULT 0,
+                sum_break_time REAL NOT NULL DEFAULT 0,
+                sum_delays_time REAL NOT NULL DEFAULT 0,
+                sum_performance REAL NOT NULL DEFAULT 0,
+                min_performance REAL,
+                max_performance REAL
+            ) WITHOUT ROWID
+        ''')
+        self._create_rollup_triggers(conn)
+        self._rebuild_rollups(conn)
+
+    def _create_rollup_triggers(self, conn):
+        """Create the triggers that keep daily_rollups in step with performance_records."""
+        # Inserts fold into the day's row; updates and deletes recompute the affected
+        # days from their (index-driven) records, since MIN/MAX cannot be un-applied.
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_rollups_insert
+            AFTER INSERT ON performance_records
+            WHEN NEW.work_date IS NOT NULL
+            BEGIN
+                INSERT INTO daily_rollups ({ROLLUP_COLUMNS})
+                VALUES (
+                    NEW.work_date, 1, COALESCE(NEW.actual_time, 0), COALESCE(NEW.break_time, 0),
+                    COALESCE(NEW.delays_time, 0), COALESCE(NEW.performance_percentage, 0),
+                    NEW.performance_percentage, NEW.performance_percentage
+                )
+                ON CONFLICT(work_date) DO UPDATE SET
+                    record_count = record_count + 1,
+                    sum_actual_time = sum_actual_time + excluded.sum_actual_time,
+                    sum_break_time = sum_break_time + excluded.sum_break_time,
+                    sum_delays_time = sum_delays_time + excluded.sum_delays_time,
+                    sum_performance = sum_performance + excluded.sum_performance,
+                    min_performance = MIN(COALESCE(min_performance, excluded.min_performance), excluded.min_performance),
+                    max_performance = MAX(COALESCE(max_performance, excluded.max_performance), excluded.max_performance);
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_rollups_delete
+            AFTER DELETE ON performance_records
+            WHEN OLD.work_date IS NOT NULL
+            BEGIN
+                DELETE FROM daily_rollups WHERE work_date = OLD.work_date;
+                INSERT INTO daily_rollups ({ROLLUP_COLUMNS})
+                {ROLLUP_SELECT} WHERE work_date = OLD.work_date GROUP BY work_date;
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_rollups_update
+            AFTER UPDATE OF work_date, actual_time, break_time, delays_time, performance_percentage
+            ON performance_records
+            BEGIN
+                DELETE FROM daily_rollups WHERE work_date IN (OLD.work_date, NEW.work_date);
+                INSERT INTO daily_rollups ({ROLLUP_COLUMNS})
+                {ROLLUP_SELECT} WHERE work_date IN (OLD.work_date, NEW.work_date) GROUP BY work_date;
+            END
+        ''')
+
+    def _migrate_created_at_index(self, conn):
+        """Index records by (created_at, id) for keyset pagination."""
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_performance_records_created
+            ON performance_records (created_at, id)
+        ''')
+
+    def _migrate_performance_histogram(self, conn):
+        """Add per-day, per-task performance histograms for percentiles, kept current by triggers."""
+        self._create_histogram(conn, 'task_name')
+
+    def _create_histogram(self, conn, task_column):
+        """Create performance_histogram keyed by task_column, with its triggers and initial data."""
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS performance_histogram (
+                work_date TEXT NOT NULL,
+                {task_column} {'INTEGER' if task_column == 'task_id' else 'TEXT'} NOT NULL,
+                bucket INTEGER NOT NULL,
+                count INTEGER NOT NULL,
+                min_value REAL,
+                max_value REAL,
+                PRIMARY KEY (work_date, {task_column}, bucket)
+            ) WITHOUT ROWID
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_histogram_insert
+            AFTER INSERT ON performance_records
+            WHEN NEW.work_date IS NOT NULL AND NEW.performance_percentage IS NOT NULL
+            BEGIN
+                {_histogram_add('NEW', task_column)}
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_histogram_delete
+            AFTER DELETE ON performance_records
+            WHEN OLD.work_date IS NOT NULL AND OLD.performance_percentage IS NOT NULL
+            BEGIN
+                {_histogram_remove('OLD', task_column)}
+            END
+        ''')
+        # An update moves the record out of its old bin and into its new one.
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_histogram_update_old
+            AFTER UPDATE OF work_date, {task_column}, performance_percentage ON performance_records
+            WHEN OLD.work_date IS NOT NULL AND OLD.performance_percentage IS NOT NULL
+            BEGIN
+                {_histogram_remove('OLD', task_column)}
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_histogram_update_new
+            AFTER UPDATE OF work_date, {task_column}, performance_percentage ON performance_records
+            WHEN NEW.work_date IS NOT NULL AND NEW.performance_percentage IS NOT NULL
+            BEGIN
+                {_histogram_add('NEW', task_column)}
+            END
+        ''')
+        self._rebuild_histogram(conn, task_column)
+
+    def _migrate_tasks(self, conn):
+        """Move task names and targets into a tasks table referenced by an integer task_id.
+
+        performance_records is rebuilt in one transaction without its task_name
+        and target_time columns, and with the break type and battery columns
+        the task-based methods write. Reads join the task back in through the
+        task_records view.
+        """
+        conn.execute('BEGIN')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                target_time REAL NOT NULL,
+                UNIQUE (name, target_time)
+            )
+        ''')
+        conn.execute('''
+            INSERT INTO tasks (name, target_time)
+            SELECT DISTINCT COALESCE(task_name, ''), COALESCE(target_time, 0)
+            FROM performance_records WHERE true
+            ON CONFLICT(name, target_time) DO NOTHING
+        ''')
+        conn.execute('''
+            CREATE TABLE performance_records_new (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                task_id INTEGER NOT NULL REFERENCES tasks (id),
+                actual_time REAL NOT NULL,
+                performance_percentage REAL NOT NULL,
+                start_time TEXT NOT NULL,
+                end_time TEXT NOT NULL,
+                break_time REAL DEFAULT 0,
+                has_break BOOLEAN DEFAULT 0,
+                break_type TEXT,
+                delays_time REAL DEFAULT 0,
+                has_delays BOOLEAN DEFAULT 0,
+                delay_notes TEXT,
+                battery_changes_count INTEGER DEFAULT 0,
+                battery_changes_time REAL DEFAULT 0,
+                skill TEXT,
+                paid_break_time REAL DEFAULT 0,
+                unpaid_break_time REAL DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                work_date TEXT
+            )
+        ''')
+        # Older databases may lack some of the optional columns; copy the ones they have.
+        old_columns = {row[1] for row in conn.execute('PRAGMA table_info(performance_records)')}
+        new_columns = [row[1] for row in conn.execute('PRAGMA table_info(performance_records_new)')]
+        copied = [column for column in new_columns if column in old_columns and column != 'task_id']
+        conn.execute(f'''
+            INSERT INTO performance_records_new (task_id, {', '.join(copied)})
+            SELECT tasks.id, {', '.join(f'r.{column}' for column in copied)}
+            FROM performance_records r
+            JOIN tasks ON tasks.name = COALESCE(r.task_name, '') AND tasks.target_time = COALESCE(r.target_time, 0)
+        ''')
+        # Dropping the old table also drops its indexes and triggers; recreate them on the new one.
+        conn.execute('DROP TABLE performance_records')
+        conn.execute('ALTER TABLE performance_records_new RENAME TO performance_records')
+        conn.execute('''
+            CREATE INDEX idx_performance_records_work_date
+            ON performance_records (work_date, created_at)
+        ''')
+        conn.execute('''
+            CREATE INDEX idx_performance_records_created
+            ON performance_records (created_at, id)
+        ''')
+        conn.execute('''
+            CREATE INDEX idx_performance_records_task
+            ON performance_records (task_id, work_date)
+        ''')
+        self._create_rollup_triggers(conn)
+        conn.execute('DROP TABLE IF EXISTS performance_histogram')
+        self._create_histogram(conn, 'task_id')
+        conn.execute('''
+            CREATE VIEW IF NOT EXISTS task_records AS
+            SELECT performance_records.*, tasks.name AS task_name, tasks.target_time
+            FROM performance_records
+            JOIN tasks ON tasks.id = performance_records.task_id
+        ''')
+
+    def _migrate_record_search(self, conn):
+        """Add the record_search FTS5 index over task names and delay notes.
+
+        The index reads its text from the task_records view and is kept in
+        step with performance_records by triggers.
+        """
+        conn.execute('BEGIN')
+        conn.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS record_search USING fts5(
+                task_name, delay_notes,
+                content='task_records', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+            )
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_search_insert
+            AFTER INSERT ON performance_records
+            BEGIN
+                {_search_index_row('NEW')}
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_search_delete
+            AFTER DELETE ON performance_records
+            BEGIN
+                {_search_index_row('OLD', 'delete')}
+            END
+        ''')
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_search_update
+            AFTER UPDATE OF task_id, delay_notes ON performance_records
+            BEGIN
+                {_search_index_row('OLD', 'delete')}
+                {_search_index_row('NEW')}
+            END
+        ''')
+        conn.execute("INSERT INTO record_search (record_search) VALUES ('rebuild')")
+
+    def _migrate_histogram_bounds(self, conn):
+        """Recreate performance_histogram with the lowest and highest value in each bin.
+
+        Percentiles are clamped to them, so a bin holding only 100% reports
+        100 rather than the bin's midpoint.
+        """
+        conn.execute('BEGIN')
+        for trigger in ('insert', 'delete', 'update_old', 'update_new'):
+            conn.execute(f'DROP TRIGGER IF EXISTS trg_histogram_{trigger}')
+        conn.execute('DROP TABLE IF EXISTS performance_histogram')
+        self._create_histogram(conn, 'task_id')
+
+    def _rebuild_rollups(self, conn):
+        """Recompute every daily_rollups row from performance_records."""
+        conn.execute('DELETE FROM daily_rollups')
+        conn.execute(f'''
+            INSERT INTO daily_rollups ({ROLLUP_COLUMNS})
+            {ROLLUP_SELECT} WHERE work_date IS NOT NULL GROUP BY work_date
+        ''')
+
+    def _rebuild_histogram(self, conn, task_column='task_id'):
+        """Recompute every performance_histogram row from performance_records."""
+        conn.execute('DELETE FROM performance_histogram')
+        conn.execute(f'''
+            INSERT INTO performance_histogram (work_date, {task_column}, bucket, count, min_value, max_value)
+            SELECT work_date, {task_column}, {_bucket_sql('performance_percentage')} as bucket, COUNT(*),
+                   MIN(performance_percentage), MAX(performance_percentage)
+            FROM performance_records
+            WHERE work_date IS NOT NULL AND performance_percentage IS NOT NULL
+            GROUP BY work_date, {task_column}, bucket
+        ''')
+
+    def rebuild_rollups(self):
+        """Rebuild the daily_rollups and performance_histogram summary tables from the raw records."""
+        with self._get_connection() as conn:
+            self._rebuild_rollups(conn)
+            self._rebuild_histogram(conn)
+            conn.commit()
+            days = conn.execute('SELECT COUNT(*) FROM daily_rollups').fetchone()[0]
+        self.stats_cache.clear()
+        logger.info(f"Rebuilt daily rollups for {days} day(s)")
+        return days
+
+    def _record_work_date(self, conn, record_id):
+        """Return the work_date of a record, or None if it does not exist."""
+        row = conn.execute('SELECT work_date FROM performance_records WHERE id = ?', (record_id,)).fetchone()
+        return row[0] if row else None
 
     def save_record(self, record_data, record_id=None):
-        """Save a performance record."""
+        """Save a performance record; returns a handle that completes once it is committed."""
+        return self._write(lambda conn: self._save_record(conn, record_data, record_id))
+
+    def _save_record(self, conn, record_data, record_id):
+        cursor = conn.cursor()
+        if record_id:
+            work_date = self._record_work_date(conn, record_id)
+            task_id = self._task_id(conn, record_data['task_name'], record_data['target_time'])
+            cursor.execute('''
+                UPDATE performance_records
+                SET task_id=?, actual_time=?, performance_percentage=?,
+                    start_time=?, end_time=?, break_time=?, has_break=?,
+                    delays_time=?, has_delays=?, delay_notes=?, skill=?,
+                    paid_break_time=?, unpaid_break_time=?
+                WHERE id=?
+            ''', (
+                task_id,
+                record_data['actual_time'], record_data['performance_percentage'],
+                record_data['start_time'], record_data['end_time'],
+                record_data['break_time'], record_data['has_break'],
+                record_data['delays_time'], record_data['has_delays'],
+                record_data['delay_notes'], record_data['skill'],
+                record_data['paid_break_time'], record_data['unpaid_break_time'],
+                record_id
+            ))
+        else:
+            work_date = _today_key()
+            task_id = self._task_id(conn, record_data['task_name'], record_data['target_time'])
+            cursor.execute('''
+                INSERT INTO performance_records (
+                    task_id, actual_time, performance_percentage,
+                    start_time, end_time, break_time, has_break,
+                    delays_time, has_delays, delay_notes, skill,
+                    paid_break_time, unpaid_break_time, work_date
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                task_id,
+                record_data['actual_time'], record_data['performance_percentage'],
+                record_data['start_time'], record_data['end_time'],
+                record_data['break_time'], record_data['has_break'],
+                record_data['delays_time'], record_data['has_delays'],
+                record_data['delay_notes'], record_data['skill'],
+                record_data['paid_break_time'], record_data['unpaid_break_time'],
+                work_date
+            ))
+        logger.info(f"Record {'updated' if record_id else 'saved'} successfully")
+        return [work_date]
+
+    def insert_records_bulk(self, records):
+        """Insert many prepared records with executemany in a single transaction."""
+        columns = [
+            'actual_time', 'performance_percentage',
+            'start_time', 'end_time', 'break_time', 'has_break',
+            'delays_time', 'has_delays', 'delay_notes', 'skill',
+            'paid_break_time', 'unpaid_break_time', 'work_date', 'created_at'
+        ]
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            if record_id:
-                cursor.execute('''
-                    UPDATE performance_records
-                    SET task_name=?, target_time=?, actual_time=?, performance_percentage=?,
-                        start_time=?, end_time=?, break_time=?, has_break=?,
-                        delays_time=?, has_delays=?, delay_notes=?, skill=?,
-                        paid_break_time=?, unpaid_break_time=?
-                    WHERE id=?
-                ''', (
-                    record_data['task_name'], record_data['target_time'],
-                    record_data['actual_time'], record_data['performance_percentage'],
-                    record_data['start_time'], record_data['end_time'],
-                    record_data['break_time'], record_data['has_break'],
-                    record_data['delays_time'], record_data['has_delays'],
-                    record_data['delay_notes'], record_data['skill'],
-                    record_data['paid_break_time'], record_data['unpaid_break_time'],
-                    record_id
-                ))
-            else:
-                cursor.execute('''
-                    INSERT INTO performance_records (
-                        task_name, target_time, actual_time, performance_percentage,
-                        start_time, end_time, break_time, has_break,
-                        delays_time, has_delays, delay_notes, skill,
-                        paid_break_time, unpaid_break_time
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    record_data['task_name'], record_data['target_time'],
-                    record_data['actual_time'], record_data['performance_percentage'],
-                    record_data['start_time'], record_data['end_time'],
-                    record_data['break_time'], record_data['has_break'],
-                    record_data['delays_time'], record_data['has_delays'],
-                    record_data['delay_notes'], record_data['skill'],
-                    record_data['paid_break_time'], record_data['unpaid_break_time']
-                ))
+            # Resolve every distinct task once up front rather than per record.
+            task_ids = self._resolve_task_ids(conn, {
+                (record['task_name'], float(record['target_time'])) for record in records
+            })
+            conn.executemany(f'''
+                INSERT INTO performance_records (task_id, {', '.join(columns)})
+                VALUES (?, {', '.join('?' for _ in columns)})
+            ''', (
+                [task_ids[(record['task_name'], float(record['target_time']))]]
+                + [record[column] for column in columns]
+                for record in records
+            ))
             conn.commit()
-            logger.info(f"Record {'updated' if record_id else 'saved'} successfully")
+        self.stats_cache.invalidate(sorted({record['work_date'] for record in records}))
+        logger.info(f"Bulk inserted {len(records)} record(s)")
+        return len(records)
 
     def get_record_by_id(self, record_id):
         """Get a performance record by ID."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM performance_records WHERE id = ?', (record_id,))
-            return cursor.fetchone()
+        return self._execute('SELECT * FROM task_records WHERE id = ?', (record_id,), fetch='one')
 
     def delete_record(self, record_id):
-        """Delete a performance record."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM performance_records WHERE id = ?', (record_id,))
-            conn.commit()
-            logger.info(f"Record {record_id} deleted successfully")
+        """Delete a performance record; returns a handle that completes once it is committed."""
+        return self._write(lambda conn: self._delete_record(conn, record_id))
+
+    def _delete_record(self, conn, record_id):
+        work_date = self._record_work_date(conn, record_id)
+        conn.execute('DELETE FROM performance_records WHERE id = ?', (record_id,))
+        logger.info(f"Record {record_id} deleted successfully")
+        return [work_date]
 
     def get_all_records(self):
         """Get all performance records."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('SELECT * FROM performance_records ORDER BY created_at DESC')
-            return cursor.fetchall()
+            cursor.row_factory = sqlite3.Row
+            cursor.execute('SELECT * FROM task_records ORDER BY created_at DESC')
+            return [dict(row) for row in cursor.fetchall()]
 
-    def start_shift(self, start_time, skill):
-        """Start a new shift."""
+    def get_records_page(self, cursor=None, limit=50, start_date=None, end_date=None,
+                         task_name=None, newest_first=True):
+        """Get one page of records ordered by (created_at, id) using keyset pagination.
+
+        Returns (records, next_cursor). Pass next_cursor back in to fetch the
+        following page; it is None once the last page has been returned.
+        """
+        conditions, params = [], []
+        if start_date is not None:
+            conditions.append('work_date >= ?')
+            params.append(_date_key(start_date))
+        if end_date is not None:
+            conditions.append('work_date <= ?')
+            params.append(_date_key(end_date))
+        if task_name is not None:
+            conditions.append('task_name = ?')
+            params.append(task_name)
+        if cursor is not None:
+            conditions.append(f"(created_at, id) {'<' if newest_first else '>'} (?, ?)")
+            params.extend(cursor)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        direction = 'DESC' if newest_first else 'ASC'
+
+        # Fetch one extra row to learn whether another page follows.
+        records = self._execute(f'''
+            SELECT * FROM task_records
+            {where}
+            ORDER BY created_at {direction}, id {direction}
+            LIMIT ?
+        ''', (*params, limit + 1), fetch='all') or []
+        if len(records) <= limit:
+            return records, None
+        records = records[:limit]
+        return records, (records[-1]['created_at'], records[-1]['id'])
+
+    def search_records(self, text, start_date=None, end_date=None, limit=50):
+        """Full-text search of task names and delay notes, best matches first.
+
+        Returns record dicts with a snippet of the matching text (matches
+        wrapped in [ ]) and their bm25 rank, lower being better. Task name
+        matches weigh more than matches in the notes. Unlike most queries here,
+        a failing search raises sqlite3.Error instead of returning no results,
+        so callers can tell the two apart.
+        """
+        match = search_match_query(text)
+        if match is None:
+            return []
+        conditions, params = ['record_search MATCH ?'], [match]
+        if start_date is not None:
+            conditions.append('r.work_date >= ?')
+            params.append(_date_key(start_date))
+        if end_date is not None:
+            conditions.append('r.work_date <= ?')
+            params.append(_date_key(end_date))
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('INSERT INTO shifts (start_time, skill) VALUES (?, ?)', (start_time, skill))
-            conn.commit()
-            logger.info(f"Shift started at {start_time} for {skill}")
+            cursor.row_factory = sqlite3.Row
+            cursor.execute(f'''
+                SELECT r.*,
+                       snippet(record_search, -1, '[', ']', '…', 10) AS snippet,
+                       bm25(record_search, 2.0, 1.0) AS rank
+                FROM record_search
+                JOIN task_records r ON r.id = record_search.rowid
+                WHERE {' AND '.join(conditions)}
+                ORDER BY rank
+                LIMIT ?
+            ''', (*params, limit))
+            return [dict(row) for row in cursor.fetchall()]
 
-    def finish_shift(self, end_time):
-        """Finish the current shift."""
+    def count_records(self, start_date=None, end_date=None):
+        """Count records in an optional work-date range using the daily rollups."""
+        result = self._execute('''
+            SELECT COALESCE(SUM(record_count), 0) as total
+            FROM daily_rollups
+            WHERE work_date >= ? AND work_date <= ?
+        ''', (
+            _date_key(start_date) if start_date is not None else '',
+            _date_key(end_date) if end_date is not None else '9999-12-31'
+        ), fetch='one')
+        return result['total'] if result else 0
+
+    def iter_records(self, start_date=None, end_date=None, chunk_size=500):
+        """Yield records oldest first as dicts, fetching chunk_size rows at a time."""
+        conditions, params = [], []
+        if start_date is not None:
+            conditions.append('work_date >= ?')
+            params.append(_date_key(start_date))
+        if end_date is not None:
+            conditions.append('work_date <= ?')
+            params.append(_date_key(end_date))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE shifts 
-                SET end_time = ? 
-                WHERE id = (SELECT id FROM shifts WHERE end_time IS NULL ORDER BY created_at DESC LIMIT 1)
-            ''', (end_time,))
+            cursor.row_factory = sqlite3.Row
+            try:
+                cursor.execute(f'''
+                    SELECT * FROM task_records
+                    {where}
+                    ORDER BY created_at, id
+                ''', params)
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield dict(row)
+            finally:
+                cursor.close()
+
+    def iter_record_chunks(self, chunk_size=1000):
+        """Yield lists of up to chunk_size records in id order.
+
+        Each chunk is a separate short query, so callers may write between chunks.
+        """
+        last_id = 0
+        while True:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = sqlite3.Row
+                cursor.execute(
+                    'SELECT * FROM task_records WHERE id > ? ORDER BY id LIMIT ?',
+                    (last_id, chunk_size)
+                )
+                chunk = [dict(row) for row in cursor.fetchall()]
+            if not chunk:
+                return
+            yield chunk
+            last_id = chunk[-1]['id']
+
+    def update_metrics_bulk(self, updates):
+        """Write recomputed metrics for many records in a single transaction.
+
+        Each update is a dict with id, work_date and the calculated metric fields.
+        """
+        with self._get_connection() as conn:
+            conn.executemany('''
+                UPDATE performance_records
+                SET actual_time = ?, break_time = ?, delays_time = ?, performance_percentage = ?
+                WHERE id = ?
+            ''', [
+                (u['actual_time'], u['break_time'], u['delays_time'], u['performance_percentage'], u['id'])
+                for u in updates
+            ])
             conn.commit()
-            logger.info(f"Shift finished at {end_time}")
+        self.stats_cache.invalidate(sorted({u['work_date'] for u in updates if u['work_date']}))
+        return len(updates)
 
-    def get_current_shift(self):
-        """Get the current shift if any."""
+    def _write(self, write):
+        """Run write(conn) in a transaction, through the write queue when one is configured.
+
+        write returns the work dates it changed, whose cached stats are dropped
+        after the commit. Returns a handle that completes once the write is
+        committed; without a queue the write is committed before returning.
+        """
+        if self.write_queue is not None:
+            return self.write_queue.submit(write)
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM shifts WHERE end_time IS NULL ORDER BY created_at DESC LIMIT 1')
-            return cursor.fetchone()
+            dates = write(conn)
+            conn.commit()
+        self.stats_cache.invalidate(dates or [])
+        handle = Future()
+        handle.set_result(None)
+        return handle
+
+    def flush(self, timeout=None):
+        """Wait until every queued write has been committed."""
+        if self.write_queue is not None:
+            self.write_queue.flush(timeout)
+
+    def start_shift(self, start_time, skill):
+        """Start a new shift; returns a handle that completes once it is committed."""
+        return self._write(lambda conn: self._start_shift(conn, start_time, skill))
+
+    def _start_shift(self, conn, start_time, skill):
+        conn.execute('INSERT INTO shifts (start_time, skill) VALUES (?, ?)', (start_time, skill))
+        logger.info(f"Shift started at {start_time} for {skill}")
+        return []
+
+    def finish_shift(self, end_time):
+        """Finish the current shift; returns a handle that completes once it is committed."""
+        return self._write(lambda conn: self._finish_shift(conn, end_time))
+
+    def _finish_shift(self, conn, end_time):
+        conn.execute('''
+            UPDATE shifts 
+            SET end_time = ? 
+            WHERE id = (SELECT id FROM shifts WHERE end_time IS NULL ORDER BY created_at DESC LIMIT 1)
+        ''', (end_time,))
+        logger.info(f"Shift finished at {end_time}")
+        return [_today_key()]
+
+    def get_current_shift(self):
+        """Get the current shift as a dict, or None if no shift is open."""
+        return self._execute(
+            'SELECT * FROM shifts WHERE end_time IS NULL ORDER BY created_at DESC LIMIT 1', fetch='one'
+        )
 
     def get_shift_history(self):
         """Get all completed shifts."""
@@ -156,9 +1231,9 @@ class Database:
     def _execute(self, query, params=(), fetch=None):
         """Execute a database query and return results."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._get_connection() as conn:
                 cursor = conn.cursor()
+                cursor.row_factory = sqlite3.Row
                 cursor.execute(query, params)
                 if fetch == 'one':
                     result = cursor.fetchone()
@@ -168,11 +1243,32 @@ class Database:
                 conn.commit()
                 return cursor.lastrowid
         except Exception as e:
-            print(f"DB Error: {e} on query: {query}")
+            logger.error(f"DB error: {e} on query: {' '.join(query.split())}")
             return None if fetch else 0
 
     # --- Task Management ---
 
+    def _task_id(self, conn, name, target_time):
+        """Return the id of a task on the caller's connection, creating the task if needed."""
+        key = (name, float(target_time))
+        task_id = self._task_ids.get(key)
+        if task_id is None:
+            task_id = self._resolve_task_ids(conn, [key])[key]
+        return task_id
+
+    def _resolve_task_ids(self, conn, keys):
+        """Map (name, target_time) keys to task ids, upserting tasks not seen before."""
+        missing = [key for key in keys if key not in self._task_ids]
+        if missing:
+            conn.executemany('''
+                INSERT INTO tasks (name, target_time) VALUES (?, ?)
+                ON CONFLICT(name, target_time) DO NOTHING
+            ''', missing)
+            for key in missing:
+                row = conn.execute('SELECT id FROM tasks WHERE name = ? AND target_time = ?', key).fetchone()
+                self._task_ids[key] = row[0]
+        return {key: self._task_ids[key] for key in keys}
+
     def get_task_by_name(self, name, target_time):
         """Get a task by name and target time."""
         return self._execute(
@@ -182,49 +1278,58 @@ class Database:
         )
 
     def create_task(self, name, target_time):
-        """Create a new task."""
-        self._execute(
-            "INSERT INTO tasks (name, target_time) VALUES (?, ?)",
-            (name, target_time)
-        )
-        return self._execute("SELECT last_insert_rowid() as id", fetch='one')['id']
+        """Create a task, returning the existing one's id if it is already there."""
+        return self.get_or_create_task(name, target_time)
 
     def get_or_create_task(self, name, target_time):
         """Get an existing task or create a new one."""
-        task = self.get_task_by_name(name, target_time)
-        if task:
-            return task['id']
-        return self.create_task(name, target_time)
+        task_id = self._task_ids.get((name, float(target_time)))
+        if task_id is not None:
+            return task_id
+        with self._get_connection() as conn:
+            task_id = self._task_id(conn, name, target_time)
+            conn.commit()
+        return task_id
 
     # --- Performance Records ---
 
     def insert_record(self, data, metrics):
-        """Insert a new performance record."""
-        task_id = self.get_or_create_task(data['task_name'], data['target_time'])
-        
+        """Insert a new performance record; returns a handle that completes once it is committed."""
+        return self._write(lambda conn: self._insert_record(conn, data, metrics))
+
+    def _insert_record(self, conn, data, metrics):
+        task_id = self._task_id(conn, data['task_name'], data['target_time'])
+        work_date = _today_key()
+
         # Calculate break time based on break type
         break_time = 15 if data.get('break_type') == 'break' else 30 if data.get('break_type') == 'lunch' else 0
-        
-        self._execute('''
+
+        conn.execute('''
             INSERT INTO performance_records 
             (task_id, actual_time, performance_percentage, start_time, end_time, 
              break_type, break_time, delays_time, has_delays, delay_notes, 
-             battery_changes_count, battery_changes_time, paid_break_time, unpaid_break_time)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+             battery_changes_count, battery_changes_time, paid_break_time, unpaid_break_time,
+             work_date)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (
             task_id, metrics['actual_work_time'], metrics['performance'],
             data['start_time'], data['finish_time'], data.get('break_type'),
             break_time, data['delays_time'], data['has_delays'],
-            data['delay_notes'], data['battery_count'], data['battery_count'] * 9,
-            data['paid_break_time'], data['unpaid_break_time']
+            data['delay_notes'], data['battery_count'], battery_changes_time(data['battery_count']),
+            data['paid_break_time'], data['unpaid_break_time'], work_date
         ))
+        return [work_date]
 
     def update_record(self, record_id, data, metrics):
-        """Update an existing performance record."""
+        """Update an existing performance record; returns a handle that completes once it is committed."""
+        return self._write(lambda conn: self._update_record(conn, record_id, data, metrics))
+
+    def _update_record(self, conn, record_id, data, metrics):
         # Calculate break time based on break type
         break_time = 15 if data.get('break_type') == 'break' else 30 if data.get('break_type') == 'lunch' else 0
-        
-        self._execute('''
+        work_date = self._record_work_date(conn, record_id)
+
+        conn.execute('''
             UPDATE performance_records 
             SET actual_time = ?, performance_percentage = ?, start_time = ?, end_time = ?, 
                 break_type = ?, break_time = ?, delays_time = ?, has_delays = ?, 
@@ -235,17 +1340,16 @@ class Database:
             metrics['actual_work_time'], metrics['performance'],
             data['start_time'], data['finish_time'], data.get('break_type'),
             break_time, data['delays_time'], data['has_delays'],
-            data['delay_notes'], data['battery_count'], data['battery_count'] * 9,
+            data['delay_notes'], data['battery_count'], battery_changes_time(data['battery_count']),
             data['paid_break_time'], data['unpaid_break_time'], record_id
         ))
+        return [work_date]
 
     def get_recent_records(self, limit=20):
         """Get recent performance records."""
         return self._execute('''
-            SELECT pr.*, t.name as task_name, t.target_time
-            FROM performance_records pr
-            JOIN tasks t ON pr.task_id = t.id
-            ORDER BY pr.created_at DESC
+            SELECT * FROM task_records
+            ORDER BY created_at DESC, id DESC
             LIMIT ?
         ''', (limit,), fetch='all')
 
@@ -270,24 +1374,26 @@ class Database:
 
     # --- Statistics ---
 
+    @cached_stats(_day_range)
     def get_daily_stats(self, date=None):
         """Get statistics for a specific date."""
         if date is None:
-            date = datetime.now().strftime('%Y-%m-%d')
+            date = datetime.now()
         
         query = '''
             SELECT 
-                AVG(performance_percentage) as avg_performance,
-                COUNT(*) as total_records,
-                SUM(actual_time) as total_time,
-                SUM(break_time) as total_break_time,
-                SUM(delays_time) as total_delay_time,
-                MAX(performance_percentage) as best_performance,
-                MIN(performance_percentage) as worst_performance
-            FROM performance_records
-            WHERE date(created_at) = ?
+                sum_performance / record_count as avg_performance,
+                record_count as total_records,
+                sum_actual_time as total_time,
+                sum_break_time as total_break_time,
+                sum_delays_time as total_delay_time,
+                max_performance as best_performance,
+                min_performance as worst_performance
+            FROM daily_rollups
+            WHERE work_date = ?
         '''
-        result = self._execute(query, (date,), fetch='one')
+        result = self._execute(query, (_date_key(date),), fetch='one')
+        percentiles = self.get_performance_percentiles(date, date)
         
         if not result:
             return {
@@ -297,9 +1403,14 @@ class Database:
                 'total_break_time': 0,
                 'total_delay_time': 0,
                 'best_performance': 0,
-                'worst_performance': 0
+                'worst_performance': 0,
+                'median_performance': 0,
+                'p90_performance': 0
             }
         
+        result['median_performance'] = percentiles['median_performance']
+        result['p90_performance'] = percentiles['p90_performance']
+
         # Convert None values to 0
         for key in result:
             if result[key] is None:
@@ -307,27 +1418,31 @@ class Database:
         
         return result
 
+    @cached_stats(_week_range)
     def get_weekly_stats(self, week_start=None):
         """Get statistics for a specific week."""
         if week_start is None:
             week_start = datetime.now()
+        elif isinstance(week_start, str):
+            week_start = datetime.strptime(week_start[:10], '%Y-%m-%d')
         
         week_end = week_start + timedelta(days=6)
         
         query = '''
             SELECT 
-                AVG(performance_percentage) as avg_performance,
-                COUNT(*) as total_records,
-                SUM(actual_time) as total_time,
-                SUM(break_time) as total_break_time,
-                SUM(delays_time) as total_delay_time,
-                COUNT(DISTINCT date(created_at)) as active_days,
-                MAX(performance_percentage) as best_performance,
-                MIN(performance_percentage) as worst_performance
-            FROM performance_records
-            WHERE date(created_at) BETWEEN ? AND ?
+                SUM(sum_performance) / SUM(record_count) as avg_performance,
+                SUM(record_count) as total_records,
+                SUM(sum_actual_time) as total_time,
+                SUM(sum_break_time) as total_break_time,
+                SUM(sum_delays_time) as total_delay_time,
+                COUNT(*) as active_days,
+                MAX(max_performance) as best_performance,
+                MIN(min_performance) as worst_performance
+            FROM daily_rollups
+            WHERE work_date BETWEEN ? AND ?
         '''
-        result = self._execute(query, (week_start.strftime('%Y-%m-%d'), week_end.strftime('%Y-%m-%d')), fetch='one')
+        result = self._execute(query, (_date_key(week_start), _date_key(week_end)), fetch='one')
+        percentiles = self.get_performance_percentiles(week_start, week_end)
         
         if not result:
             return {
@@ -338,9 +1453,14 @@ class Database:
                 'total_delay_time': 0,
                 'active_days': 0,
                 'best_performance': 0,
-                'worst_performance': 0
+                'worst_performance': 0,
+                'median_performance': 0,
+                'p90_performance': 0
             }
         
+        result['median_performance'] = percentiles['median_performance']
+        result['p90_performance'] = percentiles['p90_performance']
+
         # Convert None values to 0
         for key in result:
             if result[key] is None:
@@ -348,22 +1468,23 @@ class Database:
         
         return result
 
+    @cached_stats(_span_range)
     def get_stats_for_date_range(self, start_date, end_date):
         """Get statistics for a date range."""
         query = '''
             SELECT 
-                AVG(performance_percentage) as avg_performance,
-                COUNT(*) as total_records,
-                SUM(actual_time) as total_time,
-                SUM(break_time) as total_break_time,
-                SUM(delays_time) as total_delay_time,
-                COUNT(DISTINCT date(created_at)) as active_days,
-                MAX(performance_percentage) as best_performance,
-                MIN(performance_percentage) as worst_performance
-            FROM performance_records
-            WHERE date(created_at) BETWEEN ? AND ?
+                SUM(sum_performance) / SUM(record_count) as avg_performance,
+                SUM(record_count) as total_records,
+                SUM(sum_actual_time) as total_time,
+                SUM(sum_break_time) as total_break_time,
+                SUM(sum_delays_time) as total_delay_time,
+                COUNT(*) as active_days,
+                MAX(max_performance) as best_performance,
+                MIN(min_performance) as worst_performance
+            FROM daily_rollups
+            WHERE work_date BETWEEN ? AND ?
         '''
-        result = self._execute(query, (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')), fetch='one')
+        result = self._execute(query, (_date_key(start_date), _date_key(end_date)), fetch='one')
         
         if not result:
             return {
@@ -384,16 +1505,192 @@ class Database:
         
         return result
 
+    @cached_stats(_span_range)
+    def get_grouped_stats(self, start_date, end_date, granularity='day', by_task=False):
+        """Get statistics for a date range bucketed by day, week or month in one query.
+
+        Returns a dict keyed by the 'YYYY-MM-DD' start of each bucket that has
+        records. With by_task=True each bucket maps task names to their stats.
+        """
+        if granularity not in BUCKET_EXPRESSIONS:
+            raise ValueError(f"Unknown granularity: {granularity}")
+        bucket = BUCKET_EXPRESSIONS[granularity]
+        if by_task:
+            # Per-task figures are not rolled up, so aggregate the raw records.
+            query = f'''
+                SELECT
+                    {bucket} as bucket, task_name,
+                    AVG(performance_percentage) as avg_performance,
+                    COUNT(*) as total_records,
+                    SUM(actual_time) as total_time,
+                    SUM(break_time) as total_break_time,
+                    SUM(delays_time) as total_delay_time,
+                    COUNT(DISTINCT work_date) as active_days,
+                    MAX(performance_percentage) as best_performance,
+                    MIN(performance_percentage) as worst_performance,
+                    SUM(performance_percentage) as sum_performance
+                FROM task_records
+                WHERE work_date BETWEEN ? AND ?
+                GROUP BY bucket, task_name
+                ORDER BY bucket
+            '''
+        else:
+            query = f'''
+                SELECT
+                    {bucket} as bucket,
+                    SUM(sum_performance) / SUM(record_count) as avg_performance,
+                    SUM(record_count) as total_records,
+                    SUM(sum_actual_time) as total_time,
+                    SUM(sum_break_time) as total_break_time,
+                    SUM(sum_delays_time) as total_delay_time,
+                    COUNT(*) as active_days,
+                    MAX(max_performance) as best_performance,
+                    MIN(min_performance) as worst_performance,
+                    SUM(sum_performance) as sum_performance
+                FROM daily_rollups
+                WHERE work_date BETWEEN ? AND ?
+                GROUP BY bucket
+                ORDER BY bucket
+            '''
+        rows = self._execute(query, (_date_key(start_date), _date_key(end_date)), fetch='all') or []
+
+        grouped = {}
+        for row in rows:
+            key = row.pop('bucket')
+            for column in row:
+                if row[column] is None:
+                    row[column] = 0
+            if by_task:
+                grouped.setdefault(key, {})[row.pop('task_name')] = row
+            else:
+                grouped[key] = row
+        return grouped
+
+    @cached_stats(_span_range)
+    def get_performance_percentiles(self, start_date, end_date, task_name=None):
+        """Get the median and 90th percentile performance for a date range.
+
+        Merges the stored per-day histograms, optionally for one task only.
+        Returns median_performance and p90_performance (None without records)
+        and performance_samples.
+        """
+        query = '''
+            SELECT bucket, SUM(count) as count, MIN(min_value) as low, MAX(max_value) as high
+            FROM performance_histogram
+            WHERE work_date BETWEEN ? AND ?
+        '''
+        params = [_date_key(start_date), _date_key(end_date)]
+        if task_name is not None:
+            query += ' AND task_id IN (SELECT id FROM tasks WHERE name = ?)'
+            params.append(task_name)
+        rows = self._execute(query + ' GROUP BY bucket', params, fetch='all') or []
+        sketch = QuantileSketch()
+        for row in rows:
+            sketch.add_bucket(row['bucket'], row['count'], row['low'], row['high'])
+        return sketch.summary()
+
+    def get_performance_histograms(self, start_date, end_date, granularity='day'):
+        """Get the raw performance histogram of each day, week or month in a date range.
+
+        Returns {period: {bucket: (count, lowest, highest)}}, ready for
+        QuantileSketch.add_bucket. Unlike percentiles, these merge exactly, so
+        callers combining several databases should use them.
+        """
+        if granularity not in BUCKET_EXPRESSIONS:
+            raise ValueError(f"Unknown granularity: {granularity}")
+        rows = self._execute(f'''
+            SELECT {BUCKET_EXPRESSIONS[granularity]} as period, bucket, SUM(count) as count,
+                   MIN(min_value) as low, MAX(max_value) as high
+            FROM performance_histogram
+            WHERE work_date BETWEEN ? AND ?
+            GROUP BY period, bucket
+        ''', (_date_key(start_date), _date_key(end_date)), fetch='all') or []
+        histograms = {}
+        for row in rows:
+            histograms.setdefault(row['period'], {})[row['bucket']] = (row['count'], row['low'], row['high'])
+        return histograms
+
+    @cached_stats(_span_range)
+    def get_grouped_percentiles(self, start_date, end_date, granularity='day', by_task=False):
+        """Get median and 90th percentile performance per day, week or month in one query.
+
+        Returns a dict keyed like get_grouped_stats; with by_task=True each
+        bucket maps task names to their percentiles.
+        """
+        if granularity not in BUCKET_EXPRESSIONS:
+            raise ValueError(f"Unknown granularity: {granularity}")
+        task_column, join = ('tasks.name', 'JOIN tasks ON tasks.id = task_id') if by_task else ("''", '')
+        rows = self._execute(f'''
+            SELECT {BUCKET_EXPRESSIONS[granularity]} as period, {task_column} as task_name,
+                   bucket, SUM(count) as count, MIN(min_value) as low, MAX(max_value) as high
+            FROM performance_histogram {join}
+            WHERE work_date BETWEEN ? AND ?
+            GROUP BY period, task_name, bucket
+        ''', (_date_key(start_date), _date_key(end_date)), fetch='all') or []
+
+        sketches = {}
+        for row in rows:
+            sketch = sketches.setdefault((row['period'], row['task_name']), QuantileSketch())
+            sketch.add_bucket(row['bucket'], row['count'], row['low'], row['high'])
+        grouped = {}
+        for (period, task), sketch in sorted(sketches.items()):
+            if by_task:
+                grouped.setdefault(period, {})[task] = sketch.summary()
+            else:
+                grouped[period] = sketch.summary()
+        return grouped
+
+    @cached_stats(_trend_range)
+    def get_trends(self, start_date, end_date, windows=TREND_WINDOWS):
+        """Get per-day performance trends for a date range in a single query.
+
+        Returns one dict per day with records, oldest first, holding the day's
+        avg_performance, delay_share (delay minutes over work minutes) and
+        day_change (performance change since the previous day with records),
+        plus avg_performance_<n>d and delay_share_<n>d for each rolling window
+        of n calendar days ending on that day. Windows reach back before
+        start_date, so the first days of the range are complete too.
+        """
+        windows = [int(n) for n in windows]
+        if not windows or min(windows) < 1:
+            raise ValueError(f"Trend windows must be positive day counts: {windows}")
+        start, end = _date_key(start_date), _date_key(end_date)
+        warmup_start = _trend_range(start, end, windows)[0]
+        rolling = ',\n'.join(
+            f'''SUM(sum_performance) OVER w{n} / SUM(record_count) OVER w{n} as avg_performance_{n}d,
+                    SUM(sum_delays_time) OVER w{n} / NULLIF(SUM(sum_actual_time) OVER w{n}, 0) as delay_share_{n}d'''
+            for n in windows
+        )
+        window_clauses = ',\n'.join(
+            f"w{n} AS (ORDER BY julianday(work_date) RANGE BETWEEN {n - 1} PRECEDING AND CURRENT ROW)"
+            for n in windows
+        )
+        query = f'''
+            WITH trends AS (
+                SELECT
+                    work_date,
+                    record_count as total_records,
+                    sum_performance / record_count as avg_performance,
+                    sum_delays_time / NULLIF(sum_actual_time, 0) as delay_share,
+                    sum_performance / record_count
+                        - LAG(sum_performance / record_count) OVER (ORDER BY work_date) as day_change,
+                    {rolling}
+                FROM daily_rollups
+                WHERE work_date BETWEEN ? AND ? AND record_count > 0
+                WINDOW {window_clauses}
+            )
+            SELECT * FROM trends WHERE work_date >= ? ORDER BY work_date
+        '''
+        return self._execute(query, (warmup_start, end, start), fetch='all') or []
+
     def get_records_for_date(self, date):
         """Get all records for a specific date."""
         query = '''
-            SELECT pr.*, t.name as task_name, t.target_time
-            FROM performance_records pr
-            JOIN tasks t ON pr.task_id = t.id
-            WHERE date(pr.created_at) = ?
-            ORDER BY pr.created_at DESC
+            SELECT * FROM task_records
+            WHERE work_date = ?
+            ORDER BY created_at DESC, id DESC
         '''
-        return self._execute(query, (date.strftime('%Y-%m-%d'),), fetch='all') or []
+        return self._execute(query, (_date_key(date),), fetch='all') or []
 
     def calculate_shift_duration(self, shift_info):
         """Calculate the duration of a shift in minutes."""
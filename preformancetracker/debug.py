@@ -1,17 +1,28 @@
+import copy
 import logging
 import sys
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timedelta
 
 DEBUG = True  # Set to False in production
 
-log_history = []
+LOG_HISTORY_SIZE = 1000
+
+# Raw LogRecords, newest last; messages are only formatted when displayed.
+log_history = deque(maxlen=LOG_HISTORY_SIZE)
 
 class UILogHandler(logging.Handler):
     def emit(self, record):
-        msg = self.format(record)
-        log_history.append((datetime.now(), msg))
-        if len(log_history) > 200:
-            log_history.pop(0)
+        if record.exc_info or record.exc_text:
+            # Keep the traceback as text, like QueueHandler.prepare: a buffered
+            # exc_info would keep the exception's frames alive. The other
+            # handlers still get the original record.
+            record = copy.copy(record)
+            exc_text = record.exc_text or (self.formatter or formatter).formatException(record.exc_info)
+            record.msg = f"{record.getMessage()}\n{exc_text}"
+            record.args = None
+            record.exc_info = record.exc_text = None
+        log_history.append(record)
 
 # Configure root logger
 logger = logging.getLogger('perftracker')
@@ -21,13 +32,42 @@ formatter = logging.Formatter('%(asctime)s [%(levelname)s] %(message)s')
 handler.setFormatter(formatter)
 logger.addHandler(handler)
 
-# Also log to stderr
+# Also log to stderr; debug detail is only kept in the in-app history
 stderr_handler = logging.StreamHandler(sys.stderr)
 stderr_handler.setFormatter(formatter)
+stderr_handler.setLevel(logging.INFO)
 logger.addHandler(stderr_handler)
 
-def get_recent_logs(n=50):
-    return list(log_history)[-n:]
+def query_logs(level=None, since=None, until=None, contains=None, name=None, limit=None):
+    """Return buffered log records matching every given filter, oldest first.
+
+    level is a minimum level (number or name such as 'WARNING'); since and until
+    are datetimes or, for since, a timedelta back from now; contains is a
+    case-insensitive substring of the formatted message; name is a logger name
+    prefix. limit keeps only the newest matches.
+    """
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+    if isinstance(since, timedelta):
+        since = datetime.now() - since
+    since_ts = since.timestamp() if since else None
+    until_ts = until.timestamp() if until else None
+    needle = contains.lower() if contains else None
+
+    matches = []
+    for record in list(log_history):
+        if level is not None and record.levelno < level:
+            continue
+        if since_ts is not None and record.created < since_ts:
+            continue
+        if until_ts is not None and record.created > until_ts:
+            continue
+        if name and not record.name.startswith(name):
+            continue
+        if needle and needle not in record.getMessage().lower():
+            continue
+        matches.append(record)
+    return matches[-limit:] if limit else matches
 
 def log_exception(exc):
-    logger.exception("Exception occurred: %s", exc) 
\ No newline at end of file
+    logger.exception("Exception occurred: %s", exc)
@@ -0,0 +1,55 @@
+import csv
+import json
+import os
+from .debug import logger
+
+EXPORT_FORMATS = ('csv', 'jsonl')
+
+EXPORT_COLUMNS = [
+    'id', 'work_date', 'task_name', 'target_time', 'actual_time', 'performance_percentage',
+    'start_time', 'end_time', 'break_time', 'has_break', 'paid_break_time', 'unpaid_break_time',
+    'delays_time', 'has_delays', 'delay_notes', 'skill', 'created_at'
+]
+
+def export_records(db, path, fmt='csv', start_date=None, end_date=None, progress=None, chunk_size=500):
+    """Stream performance records to a CSV or newline-delimited JSON file.
+
+    Records are read chunk_size rows at a time and written as they arrive, so
+    memory use does not grow with the size of the export. progress, if given,
+    is called as progress(written, total) after every chunk. The file is written
+    under a temporary name and only moved into place once complete. Returns the
+    number of records written.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    total = db.count_records(start_date, end_date)
+    temp_path = f"{path}.part"
+    written = 0
+    logger.info(f"Exporting {total} record(s) to {path} as {fmt}")
+    try:
+        with open(temp_path, 'w', newline='', encoding='utf-8') as f:
+            if fmt == 'csv':
+                writer = csv.DictWriter(f, fieldnames=EXPORT_COLUMNS, extrasaction='ignore')
+                writer.writeheader()
+                write_row = writer.writerow
+            else:
+                def write_row(record):
+                    f.write(json.dumps({column: record.get(column) for column in EXPORT_COLUMNS}))
+                    f.write('\n')
+
+            for record in db.iter_records(start_date, end_date, chunk_size=chunk_size):
+                write_row(record)
+                written += 1
+                if progress and written % chunk_size == 0:
+                    progress(written, total)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    if progress:
+        progress(written, total)
+    logger.info(f"Exported {written} record(s) to {path}")
+    return written
@@ -0,0 +1,149 @@
+import csv
+import functools
+import json
+import os
+from datetime import datetime, timezone
+from .metrics import calculate_metrics
+from .debug import logger
+
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'on'}
+
+@functools.lru_cache(maxsize=65536)
+def _work_date(value):
+    """Normalise a YYYY-MM-DD date, accepting unpadded months and days."""
+    return datetime.strptime(value, '%Y-%m-%d').date().isoformat()
+
+@functools.lru_cache(maxsize=4096)
+def _clock(value):
+    """Normalise an HH:MM time, accepting an unpadded hour."""
+    return datetime.strptime(value, '%H:%M').strftime('%H:%M')
+
+@functools.lru_cache(maxsize=65536)
+def _created_at(work_date, start_time):
+    """Convert a local work date and start time to a UTC created_at timestamp."""
+    started = datetime.strptime(f"{work_date} {start_time}", '%Y-%m-%d %H:%M')
+    return started.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+def _parse_bool(value, default=False):
+    """Parse a spreadsheet-style boolean cell."""
+    if value is None or value == '':
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUE_VALUES
+
+def _parse_number(row, field, default=0):
+    """Parse an optional non-negative number, raising ValueError with the field name."""
+    value = row.get(field)
+    if value is None or value == '':
+        return default
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be a number, got {value!r}")
+    if number < 0:
+        raise ValueError(f"{field} must not be negative")
+    return number
+
+def read_records_file(path):
+    """Yield raw record rows from a .csv, .json (list of objects) or .jsonl file.
+
+    JSON lines are yielded undecoded, so import_records can report a
+    malformed line as an invalid row instead of aborting the import.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        if extension == '.csv':
+            yield from csv.DictReader(f)
+        elif extension == '.json':
+            yield from json.load(f)
+        elif extension in ('.jsonl', '.ndjson'):
+            for line in f:
+                if line.strip():
+                    yield line
+        else:
+            raise ValueError(f"Unsupported import file type: {extension}")
+
+def prepare_record(row):
+    """Validate one import row and build the record to insert.
+
+    Performance is calculated with the same formula as the add-record form.
+    Raises ValueError describing the first problem found.
+    """
+    work_date = (row.get('work_date') or row.get('date') or '').strip()
+    task_name = (row.get('task_name') or '').strip()
+    start_time = (row.get('start_time') or '').strip()
+    end_time = (row.get('end_time') or '').strip()
+    if not work_date:
+        raise ValueError("work_date is required")
+    if not task_name:
+        raise ValueError("task_name is required")
+    # Dates and times are stored zero-padded, as the range queries compare them as strings.
+    try:
+        work_date = _work_date(work_date)
+        start_time = _clock(start_time)
+    except ValueError:
+        raise ValueError("work_date must be YYYY-MM-DD and start_time HH:MM")
+    try:
+        end_time = _clock(end_time)
+    except ValueError:
+        raise ValueError("end_time must be HH:MM")
+    created_at = _created_at(work_date, start_time)
+
+    target_time = _parse_number(row, 'target_time', default=None)
+    if target_time is None:
+        raise ValueError("target_time is required")
+    paid_break_time = _parse_number(row, 'paid_break_time')
+    unpaid_break_time = _parse_number(row, 'unpaid_break_time')
+    delays_time = _parse_number(row, 'delays_time')
+    has_break = _parse_bool(row.get('has_break'), default=paid_break_time + unpaid_break_time > 0)
+    has_delays = _parse_bool(row.get('has_delays'), default=delays_time > 0)
+
+    metrics = calculate_metrics(
+        start_time, end_time, target_time,
+        paid_break_time=paid_break_time, unpaid_break_time=unpaid_break_time, has_break=has_break,
+        delays_time=delays_time, has_delays=has_delays
+    )
+    return {
+        'task_name': task_name,
+        'target_time': target_time,
+        'actual_time': metrics['actual_time'],
+        'performance_percentage': metrics['performance_percentage'],
+        'start_time': start_time,
+        'end_time': end_time,
+        'break_time': metrics['break_time'],
+        'has_break': has_break,
+        'delays_time': metrics['delays_time'],
+        'has_delays': has_delays,
+        'delay_notes': row.get('delay_notes') or '',
+        'skill': row.get('skill') or 'Picker',
+        'paid_break_time': paid_break_time,
+        'unpaid_break_time': unpaid_break_time,
+        'work_date': work_date,
+        # created_at is stored in UTC like CURRENT_TIMESTAMP; the work date is local.
+        'created_at': created_at,
+    }
+
+def import_records(db, rows):
+    """Validate rows and insert the valid ones in a single transaction.
+
+    Invalid rows are skipped and reported rather than aborting the batch.
+    Rows may be dicts or undecoded JSON lines.
+    Returns {'inserted': count, 'errors': [(row_number, message), ...]} where
+    row numbers start at 1.
+    """
+    records, errors = [], []
+    for row_number, row in enumerate(rows, start=1):
+        try:
+            if isinstance(row, str):
+                try:
+                    row = json.loads(row)
+                except ValueError:
+                    raise ValueError("invalid JSON")
+            records.append(prepare_record(row))
+        except (ValueError, TypeError, AttributeError) as e:
+            errors.append((row_number, str(e)))
+    inserted = db.insert_records_bulk(records) if records else 0
+    if errors:
+        logger.warning(f"Import skipped {len(errors)} invalid row(s)")
+    return {'inserted': inserted, 'errors': errors}
@@ -0,0 +1,128 @@
+import bisect
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from .debug import logger
+
+# Upper bounds of the latency buckets in milliseconds; a final bucket catches the rest.
+BUCKET_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+class Histogram:
+    """Fixed-bucket latency histogram with approximate percentiles."""
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, p):
+        """Return the upper bound of the bucket holding the p-th percentile (0-100)."""
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                if index < len(BUCKET_BOUNDS_MS):
+                    return min(BUCKET_BOUNDS_MS[index], self.max_ms)
+                return self.max_ms
+        return self.max_ms
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean_ms': self.total_ms / self.count if self.count else 0.0,
+            'max_ms': self.max_ms,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'buckets': {
+                (f"<={bound}" if index < len(BUCKET_BOUNDS_MS) else f">{BUCKET_BOUNDS_MS[-1]}"): count
+                for index, (bound, count) in enumerate(zip(BUCKET_BOUNDS_MS + (None,), self.counts))
+                if count
+            },
+        }
+
+class Instrumentation:
+    """Collects named latency histograms; does nothing unless enabled."""
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def record(self, name, seconds):
+        """Add one timing, in seconds, to the named histogram."""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.record(seconds * 1000)
+
+    @contextmanager
+    def span(self, name):
+        """Time the enclosed block under name."""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def instrument_database(self, db):
+        """Time every public method of a Database instance as 'db.<method>'."""
+        for name in dir(db):
+            if name.startswith('_'):
+                continue
+            method = getattr(db, name)
+            if not inspect.ismethod(method) or inspect.isgeneratorfunction(method):
+                continue
+            setattr(db, name, self._time_db_call(name, method))
+
+    def _time_db_call(self, name, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.record(f"db.{name}", time.perf_counter() - started)
+        return wrapper
+
+    def snapshot(self):
+        """Return a summary of every histogram, keyed by name."""
+        with self._lock:
+            return {name: histogram.summary() for name, histogram in sorted(self._histograms.items())}
+
+    def dump_json(self, path):
+        """Write the current snapshot to a JSON file and return its path."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'bucket_bounds_ms': BUCKET_BOUNDS_MS,
+                'timers': self.snapshot(),
+            }, f, indent=2)
+        logger.info(f"Wrote instrumentation snapshot to {path}")
+        return path
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+# Enable with PERFTRACKER_INSTRUMENT=1 or instrumentation.enable() before the app starts.
+instrumentation = Instrumentation(enabled=os.environ.get('PERFTRACKER_INSTRUMENT') == '1')
@@ -0,0 +1,140 @@
+import functools
+from datetime import datetime
+
+# Minutes allowed for each battery change. They only count against the
+# worked time when battery credit is asked for.
+BATTERY_CHANGE_MINUTES = 9
+MINUTES_PER_DAY = 24 * 60
+METRIC_FIELDS = ('actual_time', 'break_time', 'delays_time', 'performance_percentage')
+
+@functools.lru_cache(maxsize=4096)
+def _parse_clock(value):
+    """Parse an 'HH:MM' time; cached because records reuse a small set of times."""
+    return datetime.strptime(value, '%H:%M')
+
+@functools.lru_cache(maxsize=4096)
+def _clock_minutes(value):
+    """Minutes after midnight for an 'HH:MM' time."""
+    parsed = _parse_clock(value)
+    return parsed.hour * 60 + parsed.minute
+
+def _numpy():
+    """Import NumPy on first use, so importing the app does not load it; None if missing."""
+    try:
+        import numpy
+    except ImportError:  # the batch path falls back to the scalar formula
+        return None
+    return numpy
+
+def battery_changes_time(battery_count):
+    """Minutes allowed for a number of battery changes."""
+    return (battery_count or 0) * BATTERY_CHANGE_MINUTES
+
+def calculate_metrics(start_time, end_time, target_time, paid_break_time=0, unpaid_break_time=0,
+                      has_break=False, delays_time=0, has_delays=False, battery_count=0,
+                      battery_credit=False):
+    """Calculate work time and performance for a record.
+
+    start_time and end_time are 'HH:MM' strings; a finish earlier than the start
+    is taken to be on the next day. Breaks and delays only count when their flag
+    is set. Performance is the target time as a percentage of the time actually
+    worked minus delays. With battery_credit, the time allowed for battery_count
+    battery changes is taken off as well.
+    """
+    total_elapsed = _clock_minutes(end_time) - _clock_minutes(start_time)
+    if total_elapsed < 0:
+        total_elapsed += MINUTES_PER_DAY
+    total_break = float(paid_break_time) + float(unpaid_break_time) if has_break else 0
+    delays = float(delays_time) if has_delays else 0
+    actual_work = max(0, total_elapsed - total_break)
+    credit = battery_changes_time(battery_count) if battery_credit else 0
+    effective_time = max(1, actual_work - delays - credit)
+    return {
+        'actual_time': actual_work,
+        'break_time': total_break,
+        'delays_time': delays,
+        'performance_percentage': (float(target_time) / effective_time) * 100,
+    }
+
+def metric_inputs(record):
+    """Return the calculate_metrics keyword arguments for a stored record.
+
+    Records saved before paid and unpaid breaks were split only have a total
+    break_time, which is then used as the paid break. Records saved through
+    Database.insert_record take their break from break_type and leave has_break
+    unset; their break_time is used the same way.
+    """
+    paid = record.get('paid_break_time') or 0
+    unpaid = record.get('unpaid_break_time') or 0
+    has_break = bool(record.get('has_break'))
+    if not has_break and record.get('break_type'):
+        has_break, paid, unpaid = True, record.get('break_time') or 0, 0
+    elif has_break and not paid and not unpaid:
+        paid = record.get('break_time') or 0
+    return {
+        'start_time': record['start_time'],
+        'end_time': record['end_time'],
+        'target_time': record['target_time'],
+        'paid_break_time': paid,
+        'unpaid_break_time': unpaid,
+        'has_break': has_break,
+        'delays_time': record.get('delays_time') or 0,
+        'has_delays': bool(record.get('has_delays')),
+        'battery_count': record.get('battery_changes_count') or 0,
+    }
+
+def calculate_metrics_batch(records, battery_credit=False):
+    """Calculate metrics for many stored records at once.
+
+    Returns a dict of lists keyed like calculate_metrics, in record order. Uses
+    NumPy when it is installed and the scalar formula otherwise; both give the
+    same results.
+    """
+    inputs = [metric_inputs(record) for record in records]
+    np = _numpy() if inputs else None
+    if np is None:
+        results = [calculate_metrics(**values, battery_credit=battery_credit) for values in inputs]
+        return {field: [result[field] for result in results] for field in METRIC_FIELDS}
+
+    def column(name, dtype=float):
+        return np.fromiter((values[name] for values in inputs), dtype=dtype, count=len(inputs))
+
+    start = np.fromiter((_clock_minutes(values['start_time']) for values in inputs), dtype=float, count=len(inputs))
+    end = np.fromiter((_clock_minutes(values['end_time']) for values in inputs), dtype=float, count=len(inputs))
+    elapsed = end - start
+    elapsed = np.where(elapsed < 0, elapsed + MINUTES_PER_DAY, elapsed)
+    total_break = np.where(column('has_break', bool), column('paid_break_time') + column('unpaid_break_time'), 0.0)
+    delays = np.where(column('has_delays', bool), column('delays_time'), 0.0)
+    actual_work = np.maximum(0, elapsed - total_break)
+    credit = column('battery_count') * BATTERY_CHANGE_MINUTES if battery_credit else 0.0
+    effective_time = np.maximum(1, actual_work - delays - credit)
+    return {
+        'actual_time': actual_work.tolist(),
+        'break_time': total_break.tolist(),
+        'delays_time': delays.tolist(),
+        'performance_percentage': (column('target_time') / effective_time * 100).tolist(),
+    }
+
+def recompute_metrics(db, chunk_size=1000, dry_run=False, progress=None, battery_credit=False):
+    """Recompute the stored metrics of every record with the current formula.
+
+    Records are read chunk_size at a time and only rows whose values changed
+    are written back, one transaction per chunk. progress(checked, changed) is
+    called after each chunk. battery_credit is passed on to calculate_metrics.
+    Returns (checked, changed).
+    """
+    checked = changed = 0
+    for chunk in db.iter_record_chunks(chunk_size):
+        metrics = calculate_metrics_batch(chunk, battery_credit=battery_credit)
+        updates = []
+        for index, record in enumerate(chunk):
+            values = {field: metrics[field][index] for field in METRIC_FIELDS}
+            if any(record[field] is None or abs(record[field] - values[field]) > 1e-9 for field in METRIC_FIELDS):
+                updates.append(dict(values, id=record['id'], work_date=record['work_date']))
+        if updates and not dry_run:
+            db.update_metrics_bulk(updates)
+        checked += len(chunk)
+        changed += len(updates)
+        if progress:
+            progress(checked, changed)
+    return checked, changed
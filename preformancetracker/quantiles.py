@@ -0,0 +1,68 @@
+import math
+
+# Performance is bucketed into 1% wide bins; everything at or above MAX_BUCKET shares the last bin.
+MAX_BUCKET = 500
+
+def performance_bucket(performance):
+    """Return the histogram bin for a performance percentage."""
+    return min(max(int(performance), 0), MAX_BUCKET)
+
+class QuantileSketch:
+    """Mergeable fixed-width histogram of performance percentages.
+
+    Sketches for different days or tasks combine by adding their bin counts,
+    so percentiles for any range come from merging stored per-day bins rather
+    than sorting records. Each bin also remembers the lowest and highest value
+    seen in it when known. Quantiles are reported as the middle of their bin
+    clamped to those values, within half a percentage point of the exact
+    value and exact when a bin holds a single distinct value.
+    """
+    def __init__(self, counts=None, bounds=None):
+        self.counts = dict(counts or {})
+        # bucket -> (lowest, highest) value in the bin.
+        self.bounds = dict(bounds or {})
+
+    def add(self, performance, count=1):
+        self.add_bucket(performance_bucket(performance), count, performance, performance)
+
+    def add_bucket(self, bucket, count, low=None, high=None):
+        """Add count values already binned into bucket, optionally with their lowest and highest value."""
+        self.counts[bucket] = self.counts.get(bucket, 0) + count
+        if low is not None and high is not None:
+            known = self.bounds.get(bucket)
+            self.bounds[bucket] = (low, high) if known is None else (min(known[0], low), max(known[1], high))
+
+    def merge(self, other):
+        """Add another sketch's counts into this one and return self."""
+        for bucket, count in other.counts.items():
+            self.add_bucket(bucket, count, *other.bounds.get(bucket, (None, None)))
+        return self
+
+    @property
+    def count(self):
+        return sum(self.counts.values())
+
+    def quantile(self, q):
+        """Return the q-th quantile (0-1) by nearest rank, or None if the sketch is empty."""
+        total = self.count
+        if not total:
+            return None
+        rank = max(1, math.ceil(q * total))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                value = float(bucket) if bucket == MAX_BUCKET else bucket + 0.5
+                if bucket in self.bounds:
+                    low, high = self.bounds[bucket]
+                    value = min(max(value, low), high)
+                return value
+        return float(MAX_BUCKET)
+
+    def summary(self):
+        """Return the median, 90th percentile and count of the sketch."""
+        return {
+            'median_performance': self.quantile(0.5),
+            'p90_performance': self.quantile(0.9),
+            'performance_samples': self.count,
+        }
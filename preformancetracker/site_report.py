@@ -0,0 +1,96 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from .database import Database, combine_stats
+from .debug import logger
+from .quantiles import QuantileSketch
+
+SITE_GRANULARITIES = ('day', 'week')
+
+def find_worker_databases(directory, pattern='*.db'):
+    """Return the worker database files in directory, sorted by name."""
+    return sorted(path for path in glob.glob(os.path.join(directory, pattern)) if os.path.isfile(path))
+
+def worker_partial(path, start_date, end_date, granularity='day'):
+    """Aggregate one worker database into a partial that merge_partials can combine.
+
+    Runs in a pool process, so it opens its own Database and returns only
+    plain, picklable data: the worker's totals from get_stats_for_date_range
+    and, per period, the grouped stats and raw performance histogram. The
+    file is opened read-only and never migrated, so a database that is not a
+    tracker database, has an older schema or cannot be read is reported with
+    an error instead.
+    """
+    worker = os.path.splitext(os.path.basename(path))[0]
+    try:
+        db = Database(db_path=path, slow_query_ms=None, read_only=True)
+    except Exception as e:
+        return {'worker': worker, 'path': path, 'error': str(e)}
+    try:
+        return {
+            'worker': worker,
+            'path': path,
+            'total': db.get_stats_for_date_range(start_date, end_date),
+            'periods': db.get_grouped_stats(start_date, end_date, granularity),
+            'histograms': db.get_performance_histograms(start_date, end_date, granularity),
+        }
+    except Exception as e:
+        return {'worker': worker, 'path': path, 'error': str(e)}
+    finally:
+        db.close()
+
+def merge_partials(partials):
+    """Combine worker partials into per-worker and site-wide stats.
+
+    Site figures per period merge every worker's bucket with combine_stats
+    and their histograms bin by bin, so averages and percentiles are exact
+    over all records, not averages of averages. active_days counts worker
+    days.
+    """
+    workers, failed = {}, {}
+    periods, period_sketches = {}, {}
+    site_sketch = QuantileSketch()
+    for partial in partials:
+        if 'error' in partial:
+            failed[partial['worker']] = partial['error']
+            continue
+        worker_sketch = QuantileSketch()
+        for period, bins in partial['histograms'].items():
+            sketch = QuantileSketch()
+            for bucket, (count, low, high) in bins.items():
+                sketch.add_bucket(bucket, count, low, high)
+            worker_sketch.merge(sketch)
+            period_sketches.setdefault(period, QuantileSketch()).merge(sketch)
+        site_sketch.merge(worker_sketch)
+        for period, stats in partial['periods'].items():
+            periods.setdefault(period, []).append(stats)
+        workers[partial['worker']] = dict(partial['total'], **worker_sketch.summary())
+
+    site_periods = {
+        period: dict(combine_stats(buckets), workers=len(buckets), **period_sketches[period].summary())
+        for period, buckets in sorted(periods.items())
+    }
+    site_total = combine_stats(bucket for buckets in periods.values() for bucket in buckets)
+    site_total.update(site_sketch.summary(), workers=len(workers))
+    return {'workers': workers, 'failed': failed, 'periods': site_periods, 'total': site_total}
+
+def build_site_report(directory, start_date, end_date, granularity='day', processes=None, pattern='*.db'):
+    """Aggregate every worker database in directory using a pool of processes.
+
+    Each database is aggregated in its own task and the partial results are
+    merged at the end. processes=1 runs everything in this process.
+    """
+    if granularity not in SITE_GRANULARITIES:
+        raise ValueError(f"Unknown granularity: {granularity}")
+    paths = find_worker_databases(directory, pattern)
+    logger.info(f"Aggregating {len(paths)} worker database(s) from {directory}")
+    args = ([start_date] * len(paths), [end_date] * len(paths), [granularity] * len(paths))
+    if processes == 1 or len(paths) <= 1:
+        partials = list(map(worker_partial, paths, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            partials = list(executor.map(worker_partial, paths, *args))
+    report = merge_partials(partials)
+    for worker, error in report['failed'].items():
+        logger.warning(f"Skipped worker database {worker}: {error}")
+    return report
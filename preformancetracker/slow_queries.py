@@ -0,0 +1,158 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from .debug import logger
+
+DEFAULT_THRESHOLD_MS = 100
+DEFAULT_HISTORY_SIZE = 100
+
+def params_shape(params):
+    """Describe query parameters by type only, so values are never logged."""
+    if isinstance(params, dict):
+        return {key: type(value).__name__ for key, value in params.items()}
+    return [type(value).__name__ for value in params]
+
+class SlowQueryLog:
+    """Keeps the most recent statements that ran longer than a threshold.
+
+    Each entry records the SQL, the shape of its parameters, the duration,
+    the number of rows returned or changed and the EXPLAIN QUERY PLAN output.
+    Entries can also be appended to a JSON Lines file.
+    """
+    def __init__(self, threshold_ms=DEFAULT_THRESHOLD_MS, maxlen=DEFAULT_HISTORY_SIZE, path=None):
+        self.threshold_ms = threshold_ms
+        self.path = path
+        self._entries = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def is_slow(self, seconds):
+        return self.threshold_ms is not None and seconds * 1000 >= self.threshold_ms
+
+    def record(self, conn, sql, params, seconds, rows):
+        """Store a slow statement, capturing its query plan on the same connection."""
+        entry = {
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'sql': ' '.join(sql.split()),
+            'params': params_shape(params) if params is not None else 'executemany',
+            'duration_ms': round(seconds * 1000, 2),
+            'rows': rows,
+            'plan': self._explain(conn, sql, params),
+        }
+        with self._lock:
+            self._entries.append(entry)
+            if self.path:
+                try:
+                    with open(self.path, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps(entry) + '\n')
+                except OSError as e:
+                    logger.warning(f"Could not write slow query log {self.path}: {e}")
+        logger.warning(f"Slow query ({entry['duration_ms']:.1f}ms, {rows} rows): {entry['sql'][:200]}")
+
+    @staticmethod
+    def _explain(conn, sql, params):
+        """Return the EXPLAIN QUERY PLAN lines for a statement, or [] if it cannot be explained."""
+        try:
+            # A plain cursor keeps the plan query itself out of the slow query log.
+            cursor = sqlite3.Connection.cursor(conn, sqlite3.Cursor)
+            cursor.row_factory = None
+            rows = cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params if params is not None else ()).fetchall()
+            return [row[3] for row in rows]
+        except sqlite3.Error:
+            return []
+
+    def entries(self):
+        """Return the recorded slow queries, oldest first."""
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that times each statement, including fetching its rows.
+
+    A statement is finished when its rows are exhausted, when the cursor runs
+    another statement or is closed, or when the cursor is garbage collected.
+    """
+    def _start(self, sql, params):
+        self._finish()
+        self._sql = sql
+        self._params = params
+        self._elapsed = 0.0
+        self._rows = 0
+
+    def _finish(self):
+        sql = getattr(self, '_sql', None)
+        if sql is None:
+            return
+        self._sql = None
+        slow_queries = self.connection.slow_queries
+        if slow_queries is not None and slow_queries.is_slow(self._elapsed):
+            rows = self._rows if self.rowcount < 0 else max(self._rows, self.rowcount)
+            slow_queries.record(self.connection, sql, self._params, self._elapsed, rows)
+
+    def _timed(self, method, *args):
+        started = time.perf_counter()
+        try:
+            return method(self, *args)
+        finally:
+            self._elapsed += time.perf_counter() - started
+
+    def execute(self, sql, parameters=()):
+        self._start(sql, parameters)
+        return self._timed(sqlite3.Cursor.execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._start(sql, None)
+        result = self._timed(sqlite3.Cursor.executemany, sql, seq_of_parameters)
+        self._finish()
+        return result
+
+    def fetchone(self):
+        row = self._timed(sqlite3.Cursor.fetchone)
+        if row is None:
+            self._finish()
+        else:
+            self._rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed(sqlite3.Cursor.fetchmany, self.arraysize if size is None else size)
+        self._rows += len(rows)
+        if not rows:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(sqlite3.Cursor.fetchall)
+        self._rows += len(rows)
+        self._finish()
+        return rows
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+class TimedConnection(sqlite3.Connection):
+    """Connection whose cursors report slow statements to a SlowQueryLog."""
+    slow_queries = None
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    # The execute shortcuts would otherwise use a plain cursor and go untimed.
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
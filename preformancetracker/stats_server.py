@@ -0,0 +1,212 @@
+import asyncio
+import json
+import zlib
+from collections import OrderedDict
+from datetime import date
+from email.utils import formatdate
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlsplit
+from .debug import logger
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_CACHE_SIZE = 128
+MAX_RECENT_RECORDS = 500
+# Largest request head accepted; longer requests are dropped. The API only serves GET requests.
+MAX_REQUEST_BYTES = 16 * 1024
+REQUEST_TIMEOUT = 10
+
+class BadRequest(ValueError):
+    """A request the API cannot answer; reported to the client as 400."""
+
+def _date_param(query, name, default=None):
+    value = query.get(name)
+    if value is None:
+        if default is None:
+            raise BadRequest(f"Missing parameter: {name}")
+        return default
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise BadRequest(f"{name} must be a YYYY-MM-DD date") from None
+
+def _int_param(query, name, default, maximum):
+    try:
+        value = int(query.get(name, default))
+    except ValueError:
+        raise BadRequest(f"{name} must be an integer") from None
+    if not 1 <= value <= maximum:
+        raise BadRequest(f"{name} must be between 1 and {maximum}")
+    return value
+
+class StatsServer:
+    """Read-only HTTP/JSON API over a Database, served with asyncio streams.
+
+    Endpoints (GET or HEAD):
+        /stats/daily?date=YYYY-MM-DD         daily stats (default today)
+        /stats/weekly?week_start=YYYY-MM-DD  weekly stats (default today, as the stats screen)
+        /stats/range?start=...&end=...       totals and percentiles for a date range
+        /records/recent?limit=20             most recent records
+        /shift/current                       the open shift, or null
+
+    Responses carry an ETag built from the database's data_version and the
+    resolved request, so clients polling with If-None-Match get a 304 without
+    any stats being computed until something is written. Rendered bodies are
+    kept in an LRU cache for the same data version, and at most
+    max_concurrency requests query the database at once.
+    """
+    def __init__(self, adb, host=DEFAULT_HOST, port=DEFAULT_PORT,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY, cache_size=DEFAULT_CACHE_SIZE):
+        self.adb = adb
+        self.host = host
+        self.port = port
+        self.cache_size = cache_size
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._cache = OrderedDict()
+        self._server = None
+        self.requests = 0
+        self.not_modified = 0
+        self.cache_hits = 0
+        self.routes = {
+            '/stats/daily': self._daily,
+            '/stats/weekly': self._weekly,
+            '/stats/range': self._range,
+            '/records/recent': self._recent,
+            '/shift/current': self._current_shift,
+        }
+
+    async def start(self):
+        """Start listening; returns once the socket is bound."""
+        self._server = await asyncio.start_server(
+            self._handle, self.host, self.port, limit=MAX_REQUEST_BYTES
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Stats API listening on http://{self.host}:{self.port}")
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self):
+        """Stop accepting connections."""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            logger.info('Stats API stopped')
+
+    # --- Endpoints: each resolves its parameters into a cache key and a loader ---
+
+    def _daily(self, query):
+        day = _date_param(query, 'date', date.today().isoformat())
+        return ('daily', day), lambda: self.adb.get_daily_stats(day)
+
+    def _weekly(self, query):
+        week_start = _date_param(query, 'week_start', date.today().isoformat())
+        return ('weekly', week_start), lambda: self.adb.get_weekly_stats(week_start)
+
+    def _range(self, query):
+        start, end = _date_param(query, 'start'), _date_param(query, 'end')
+        if start > end:
+            raise BadRequest('start must not be after end')
+
+        async def load():
+            stats = await self.adb.get_stats_for_date_range(start, end)
+            stats.update(await self.adb.get_performance_percentiles(start, end))
+            return stats
+        return ('range', start, end), load
+
+    def _recent(self, query):
+        limit = _int_param(query, 'limit', 20, MAX_RECENT_RECORDS)
+        return ('recent', limit), lambda: self.adb.get_recent_records(limit)
+
+    def _current_shift(self, query):
+        return ('shift',), lambda: self.adb.get_current_shift()
+
+    # --- HTTP ---
+
+    async def _handle(self, reader, writer):
+        try:
+            try:
+                head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), REQUEST_TIMEOUT)
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError):
+                return
+            request_line, *header_lines = head.decode('latin-1').split('\r\n')
+            parts = request_line.split()
+            if len(parts) != 3:
+                await self._send(writer, HTTPStatus.BAD_REQUEST, {'error': 'Malformed request line'})
+                return
+            method, target, _ = parts
+            headers = {}
+            for line in header_lines:
+                name, sep, value = line.partition(':')
+                if sep:
+                    headers[name.strip().lower()] = value.strip()
+            status, body, etag = await self._respond(method, target, headers)
+            await self._send(writer, status, body, etag, head_only=method == 'HEAD')
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, method, target, headers):
+        """Return (status, body, etag) for a request."""
+        self.requests += 1
+        if method not in ('GET', 'HEAD'):
+            return HTTPStatus.METHOD_NOT_ALLOWED, {'error': f"{method} is not supported"}, None
+        url = urlsplit(target)
+        route = self.routes.get(url.path.rstrip('/') or '/')
+        if route is None:
+            return HTTPStatus.NOT_FOUND, {'error': f"No such endpoint: {url.path}", 'endpoints': sorted(self.routes)}, None
+        try:
+            key, load = route(dict(parse_qsl(url.query)))
+        except BadRequest as e:
+            return HTTPStatus.BAD_REQUEST, {'error': str(e)}, None
+
+        async with self._semaphore:
+            try:
+                await self.adb.sync_external_writes()
+                version = self.adb.data_version
+                etag = f'"{version}-{zlib.crc32(repr(key).encode()):08x}"'
+                if etag in [tag.strip() for tag in headers.get('if-none-match', '').split(',')]:
+                    self.not_modified += 1
+                    return HTTPStatus.NOT_MODIFIED, None, etag
+                cached = self._cache.get(key)
+                if cached is not None and cached[0] == version:
+                    self._cache.move_to_end(key)
+                    self.cache_hits += 1
+                    return HTTPStatus.OK, cached[1], etag
+                body = json.dumps(await load(), default=str).encode('utf-8')
+            except Exception as e:
+                logger.error(f"Stats API error for {target}: {e}")
+                return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': 'Internal error'}, None
+        self._cache[key] = (version, body)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return HTTPStatus.OK, body, etag
+
+    async def _send(self, writer, status, body, etag=None, head_only=False):
+        if body is None:
+            payload = b''
+        elif isinstance(body, bytes):
+            payload = body
+        else:
+            payload = json.dumps(body).encode('utf-8')
+        lines = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            f"Date: {formatdate(usegmt=True)}",
+            'Connection: close',
+            # Clients may keep responses but must revalidate them with If-None-Match.
+            'Cache-Control: no-cache',
+        ]
+        if etag:
+            lines.append(f"ETag: {etag}")
+        if status != HTTPStatus.NOT_MODIFIED:
+            lines += ['Content-Type: application/json', f"Content-Length: {len(payload)}"]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        if payload and not head_only and status != HTTPStatus.NOT_MODIFIED:
+            writer.write(payload)
+        await writer.drain()
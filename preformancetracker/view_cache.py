@@ -0,0 +1,38 @@
+from collections import OrderedDict
+from .debug import logger
+
+class ViewCache:
+    """LRU cache of constructed view widget trees keyed by view name and arguments."""
+    def __init__(self, maxsize=8):
+        self.maxsize = maxsize
+        self._views = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(view_name, kwargs):
+        return view_name, tuple(sorted(kwargs.items()))
+
+    def get(self, view_name, kwargs):
+        """Return the cached widget tree for a view, or None."""
+        key = self._key(view_name, kwargs)
+        view = self._views.get(key)
+        if view is None:
+            self.misses += 1
+            return None
+        self._views.move_to_end(key)
+        self.hits += 1
+        return view
+
+    def put(self, view_name, kwargs, view):
+        """Cache a constructed view, evicting the least recently used one if full."""
+        self._views[self._key(view_name, kwargs)] = view
+        self._views.move_to_end(self._key(view_name, kwargs))
+        while len(self._views) > self.maxsize:
+            (evicted, _), _ = self._views.popitem(last=False)
+            logger.debug(f"Evicted cached view: {evicted}")
+
+    def invalidate(self, view_name=None):
+        """Drop cached views with the given name, or every cached view."""
+        for key in [k for k in self._views if view_name is None or k[0] == view_name]:
+            del self._views[key]
@@ -31,7 +31,7 @@ def create(app):
     
     prev_month_btn = toga.Button(
         "◀ Previous",
-        on_press=lambda w: update_calendar(app, calendar_box, -1),
+        on_press=lambda w: update_calendar(app, calendar_box, calendar_box.month_offset - 1),
         style=Pack(padding=5, color=TEXT_COLOR)
     )
     nav_box.add(prev_month_btn)
@@ -44,7 +44,7 @@ def create(app):
     
     next_month_btn = toga.Button(
         "Next ▶",
-        on_press=lambda w: update_calendar(app, calendar_box, 1),
+        on_press=lambda w: update_calendar(app, calendar_box, calendar_box.month_offset + 1),
         style=Pack(padding=5, color=TEXT_COLOR)
     )
     nav_box.add(next_month_btn)
@@ -53,23 +53,43 @@ def create(app):
 
     # Calendar Grid
     calendar_box = toga.Box(style=Pack(direction=COLUMN))
+    calendar_box.month_offset = 0
+    calendar_box.month_label = month_label
     container.add(calendar_box)
 
     # Initial calendar display
     update_calendar(app, calendar_box, 0)
 
     scroll_container.content = container
+    scroll_container.calendar_box = calendar_box
     return scroll_container
 
+def refresh(app, scroll_container):
+    """Reload the data shown in a cached calendar view."""
+    calendar_box = scroll_container.calendar_box
+    update_calendar(app, calendar_box, calendar_box.month_offset)
+
+def get_month_start(month_offset):
+    """Get the first day of the month month_offset months from the current one."""
+    today = datetime.now()
+    months = today.year * 12 + today.month - 1 + month_offset
+    return today.replace(year=months // 12, month=months % 12 + 1, day=1)
+
 def update_calendar(app, container, month_offset):
-    """Update the calendar display based on the selected month."""
-    # Clear existing calendar
+    """Show a loading message and load the selected month in the background."""
+    container.month_offset = month_offset
+    container.month_label.text = get_month_start(month_offset).strftime("%B %Y")
     container.clear()
+    container.add(toga.Label(
+        "Loading...",
+        style=Pack(padding=10, font_style='italic', text_align='center', color=TEXT_COLOR)
+    ))
+    app.loop.create_task(_load_calendar(app, container, month_offset))
 
+async def _load_calendar(app, container, month_offset):
+    """Update the calendar display based on the selected month."""
     # Calculate the target month
-    today = datetime.now()
-    target_month = today.replace(day=1) + timedelta(days=32 * month_offset)
-    target_month = target_month.replace(day=1)
+    target_month = get_month_start(month_offset)
 
     # Create calendar grid
     grid = toga.Box(style=Pack(direction=COLUMN))
@@ -93,6 +113,14 @@ def update_calendar(app, container, month_offset):
     # Add calendar days
     first_day = target_month.weekday()
     days_in_month = (target_month.replace(month=target_month.month % 12 + 1, day=1) - timedelta(days=1)).day
+    month_stats = await app.adb.get_grouped_stats(target_month, target_month.replace(day=days_in_month))
+
+    # Ignore results for a month the user has already paged away from
+    if container.month_offset != month_offset:
+        return
+
+    # Clear existing calendar
+    container.clear()
     
     current_row = toga.Box(style=Pack(direction=ROW))
     
@@ -108,14 +136,13 @@ def update_calendar(app, container, month_offset):
         
         # Get performance data for this day
         date = target_month.replace(day=day)
-        stats = app.db.get_daily_stats(date)
+        stats = month_stats.get(date.strftime('%Y-%m-%d'))
         
         # Create day cell
         day_box = toga.Box(style=Pack(
             flex=1,
             padding=5,
-            background_color=CARD_STYLE['background_color'] if stats else '#ffffff',
-            border_radius=5
+            background_color=CARD_STYLE['background_color'] if stats else '#ffffff'
         ))
         
         # Add day number
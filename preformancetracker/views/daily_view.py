@@ -6,6 +6,49 @@ from ..styles import (
     CONTENT_STYLE, SCROLL_CONTAINER_STYLE, H2_STYLE, LABEL_STYLE,
     CARD_STYLE, TEXT_COLOR, SUCCESS_COLOR, ERROR_COLOR
 )
+from .keyed_list import KeyedList
+
+class RecordCard:
+    """Card showing a single record, updated in place when reused."""
+    def __init__(self):
+        # Task Name and Performance
+        self.task_label = toga.Label('', style=Pack(font_weight='bold', color=TEXT_COLOR))
+        self.performance_label = toga.Label('', style=Pack(margin_left=10))
+        task_box = toga.Box(
+            style=Pack(direction=ROW, padding_bottom=5),
+            children=[self.task_label, self.performance_label]
+        )
+
+        # Time Info
+        self.time_label = toga.Label('', style=Pack(font_size=12, color=TEXT_COLOR))
+
+        # Break and Delay Info
+        self.details_label = toga.Label('', style=Pack(font_size=12, color='#666666'))
+
+        self.widget = toga.Box(
+            style=Pack(direction=COLUMN, padding=10, background_color='#ffffff', margin_bottom=5),
+            children=[task_box, self.time_label, self.details_label]
+        )
+
+    def update(self, record):
+        self.task_label.text = record['task_name']
+        self.performance_label.text = f"Performance: {record['performance_percentage']:.1f}%"
+        self.performance_label.style.color = SUCCESS_COLOR if record['performance_percentage'] >= 100 else ERROR_COLOR
+        self.time_label.text = (
+            f"Start: {record['start_time']} | "
+            f"Finish: {record['end_time']} | "
+            f"Duration: {record['actual_time']:.1f} min"
+        )
+
+        details = []
+        if record['has_break']:
+            details.append(f"Break: {record['break_time']:.1f} min")
+        if record['has_delays']:
+            details.append(f"Delays: {record['delays_time']:.1f} min")
+        if (record.get('battery_changes_count') or 0) > 0:
+            details.append(f"Battery Changes: {record['battery_changes_count']}")
+        self.details_label.text = " | ".join(details)
+        self.details_label.style.display = 'pack' if details else 'none'
 
 def create(app):
     """Create the daily view."""
@@ -31,7 +74,7 @@ def create(app):
     
     prev_day_btn = toga.Button(
         "◀ Previous",
-        on_press=lambda w: update_day(app, container, -1),
+        on_press=lambda w: update_day(app, content_box, content_box.day_offset - 1),
         style=Pack(padding=5, color=TEXT_COLOR)
     )
     nav_box.add(prev_day_btn)
@@ -44,7 +87,7 @@ def create(app):
     
     next_day_btn = toga.Button(
         "Next ▶",
-        on_press=lambda w: update_day(app, container, 1),
+        on_press=lambda w: update_day(app, content_box, content_box.day_offset + 1),
         style=Pack(padding=5, color=TEXT_COLOR)
     )
     nav_box.add(next_day_btn)
@@ -53,116 +96,90 @@ def create(app):
 
     # Content Area
     content_box = toga.Box(style=Pack(direction=COLUMN))
+    content_box.day_offset = 0
+    content_box.date_label = date_label
+
+    content_box.status_label = toga.Label(
+        "Loading...",
+        style=Pack(padding=10, font_style='italic', text_align='center', color=TEXT_COLOR)
+    )
+    content_box.add(content_box.status_label)
+
+    # Summary Box
+    content_box.summary_labels = [
+        toga.Label('', style=Pack(font_size=16, padding_bottom=5)),
+        toga.Label('', style=Pack(font_size=14, padding_bottom=5, color=TEXT_COLOR)),
+        toga.Label('', style=Pack(font_size=14, color=TEXT_COLOR)),
+    ]
+    content_box.summary_box = toga.Box(
+        style=Pack(
+            direction=COLUMN,
+            padding=10,
+            background_color=CARD_STYLE.background_color,
+            margin_bottom=10,
+            display='none'
+        ),
+        children=content_box.summary_labels
+    )
+    content_box.add(content_box.summary_box)
+
+    # Records List
+    records_box = toga.Box(style=Pack(direction=COLUMN))
+    content_box.records = KeyedList(records_box, RecordCard)
+    content_box.add(records_box)
     container.add(content_box)
 
     # Initial day display
     update_day(app, content_box, 0)
 
     scroll_container.content = container
+    scroll_container.content_box = content_box
     return scroll_container
 
+def refresh(app, scroll_container):
+    """Reload the data shown in a cached daily view."""
+    content_box = scroll_container.content_box
+    update_day(app, content_box, content_box.day_offset)
+
 def update_day(app, container, day_offset):
-    """Update the daily view based on the selected day."""
-    # Clear existing content
-    container.clear()
+    """Switch to the selected day and load its data in the background."""
+    container.day_offset = day_offset
+    target_date = datetime.now() + timedelta(days=day_offset)
+    container.date_label.text = target_date.strftime("%B %d, %Y")
+    container.status_label.text = "Loading..."
+    container.status_label.style.display = 'pack'
+    app.loop.create_task(_load_day(app, container, day_offset))
 
+async def _load_day(app, container, day_offset):
+    """Update the daily view based on the selected day."""
     # Calculate target date
     today = datetime.now()
     target_date = today + timedelta(days=day_offset)
     
     # Get daily stats
-    stats = app.db.get_daily_stats(target_date)
+    date_key = target_date.strftime('%Y-%m-%d')
+    stats = (await app.adb.get_grouped_stats(date_key, date_key)).get(date_key)
+    records = await app.adb.get_records_for_date(target_date) if stats else []
+
+    # Ignore results for a day the user has already paged away from
+    if container.day_offset != day_offset:
+        return
     
     if not stats or not stats.get('total_records'):
-        container.add(toga.Label(
-            "No records for this day.",
-            style=Pack(
-                padding=10,
-                font_style='italic',
-                text_align='center',
-                color=TEXT_COLOR
-            )
-        ))
+        container.status_label.text = "No records for this day."
+        container.summary_box.style.display = 'none'
+        container.records.update([], key=lambda record: record['id'])
         return
 
-    # Summary Box
-    summary_box = toga.Box(style=Pack(
-        direction=COLUMN,
-        padding=10,
-        background_color=CARD_STYLE['background_color'],
-        border_radius=5,
-        margin_bottom=10
-    ))
-    
-    # Average Performance
-    perf_color = SUCCESS_COLOR if stats['avg_performance'] >= 100 else ERROR_COLOR
-    summary_box.add(toga.Label(
-        f"Daily Average: {stats['avg_performance']:.1f}%",
-        style=Pack(font_size=16, color=perf_color, padding_bottom=5)
-    ))
-    
-    # Total Records
-    summary_box.add(toga.Label(
-        f"Total Records: {stats['total_records']}",
-        style=Pack(font_size=14, padding_bottom=5, color=TEXT_COLOR)
-    ))
-    
-    # Total Time
-    summary_box.add(toga.Label(
-        f"Total Work Time: {stats['total_time']:.1f} minutes",
-        style=Pack(font_size=14, color=TEXT_COLOR)
-    ))
-    
-    container.add(summary_box)
+    container.status_label.style.display = 'none'
+    container.summary_box.style.display = 'pack'
+
+    # Average Performance, Total Records, Total Time
+    average_label, records_label, time_label = container.summary_labels
+    average_label.text = f"Daily Average: {stats['avg_performance']:.1f}%"
+    average_label.style.color = SUCCESS_COLOR if stats['avg_performance'] >= 100 else ERROR_COLOR
+    records_label.text = f"Total Records: {stats['total_records']}"
+    time_label.text = f"Total Work Time: {stats['total_time']:.1f} minutes"
 
     # Records List
-    records = app.db.get_records_for_date(target_date)
-    
-    for record in records:
-        record_box = toga.Box(style=Pack(
-            direction=COLUMN,
-            padding=10,
-            background_color='#ffffff',
-            border_radius=5,
-            margin_bottom=5
-        ))
-        
-        # Task Name and Performance
-        task_box = toga.Box(style=Pack(direction=ROW, padding_bottom=5))
-        task_box.add(toga.Label(
-            record['task_name'],
-            style=Pack(font_weight='bold', color=TEXT_COLOR)
-        ))
-        task_box.add(toga.Label(
-            f"Performance: {record['performance_percentage']:.1f}%",
-            style=Pack(
-                margin_left=10,
-                color=SUCCESS_COLOR if record['performance_percentage'] >= 100 else ERROR_COLOR
-            )
-        ))
-        record_box.add(task_box)
-        
-        # Time Info
-        time_info = (
-            f"Start: {record['start_time']} | "
-            f"Finish: {record['end_time']} | "
-            f"Duration: {record['actual_time']:.1f} min"
-        )
-        record_box.add(toga.Label(time_info, style=Pack(font_size=12, color=TEXT_COLOR)))
-        
-        # Break and Delay Info
-        details = []
-        if record['has_break']:
-            details.append(f"Break: {record['break_time']:.1f} min")
-        if record['has_delays']:
-            details.append(f"Delays: {record['delays_time']:.1f} min")
-        if record['battery_changes_count'] > 0:
-            details.append(f"Battery Changes: {record['battery_changes_count']}")
-        
-        if details:
-            record_box.add(toga.Label(
-                " | ".join(details),
-                style=Pack(font_size=12, color='#666666')
-            ))
-        
-        container.add(record_box) 
\ No newline at end of file
+    container.records.update(records, key=lambda record: record['id'])
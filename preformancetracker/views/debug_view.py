@@ -0,0 +1,154 @@
+import os
+import toga
+from toga.style import Pack
+from toga.style.pack import COLUMN, ROW
+from datetime import datetime, timedelta
+from ..styles import TEXT_COLOR
+from ..debug import query_logs, logger
+from ..instrumentation import instrumentation
+from ..slow_queries import DEFAULT_THRESHOLD_MS
+
+LEVELS = ['ALL', 'DEBUG', 'INFO', 'WARNING', 'ERROR']
+TIME_WINDOWS = {
+    'Any time': None,
+    'Last 5 minutes': timedelta(minutes=5),
+    'Last hour': timedelta(hours=1),
+}
+MAX_ROWS = 500
+
+def create(app):
+    """Create the debug panel."""
+    box = toga.Box(style=Pack(direction=COLUMN, padding=20, flex=1))
+    box.add(toga.Label('Debug Panel', style=Pack(font_size=20, font_weight='bold', padding_bottom=10)))
+
+    cache = app.db.stats_cache.info()
+    box.add(toga.Label(
+        f"Stats cache: {cache['hits']} hits / {cache['misses']} misses "
+        f"({cache['hit_rate']:.0%} hit rate), {cache['entries']}/{cache['maxsize']} entries, "
+        f"{cache['invalidations']} invalidated, {cache['evictions']} evicted",
+        style=Pack(font_size=12, padding_bottom=10)
+    ))
+    box.add(toga.Label(
+        'Startup: ' + ', '.join(
+            f"{name} {seconds * 1000:.0f}ms" for name, seconds in app.startup_timings.items()
+        ),
+        style=Pack(font_size=12, padding_bottom=10)
+    ))
+
+    box.add(create_timings_section(app))
+    box.add(create_slow_queries_section(app.db.slow_queries))
+
+    # Log Filters
+    filters = {
+        'level': toga.Selection(items=LEVELS, value='INFO', on_change=lambda w: show_logs(filters, table)),
+        'window': toga.Selection(items=list(TIME_WINDOWS), on_change=lambda w: show_logs(filters, table)),
+        'contains': toga.TextInput(
+            placeholder='Search messages',
+            on_change=lambda w: show_logs(filters, table),
+            style=Pack(flex=1)
+        ),
+    }
+    filter_box = toga.Box(style=Pack(direction=ROW, padding_bottom=10))
+    filter_box.add(filters['level'])
+    filter_box.add(filters['window'])
+    filter_box.add(filters['contains'])
+    filter_box.add(toga.Button('Refresh', on_press=lambda w: show_logs(filters, table), style=Pack(color=TEXT_COLOR)))
+    box.add(filter_box)
+
+    # Log Table
+    table = toga.Table(headings=['Time', 'Level', 'Logger', 'Message'], style=Pack(flex=1))
+    box.add(table)
+    show_logs(filters, table)
+
+    back_button = toga.Button('Back to Home', on_press=lambda w: app.set_view('home'))
+    box.add(back_button)
+    return box
+
+def create_timings_section(app):
+    """Create the latency histogram summary, or a hint when instrumentation is off."""
+    section = toga.Box(style=Pack(direction=COLUMN, padding_bottom=10))
+    if not instrumentation.enabled:
+        section.add(toga.Label(
+            'Timings: instrumentation is off (set PERFTRACKER_INSTRUMENT=1 to enable)',
+            style=Pack(font_size=12)
+        ))
+        return section
+
+    table = toga.Table(
+        headings=['Timer', 'Count', 'p50 ms', 'p95 ms', 'p99 ms', 'Max ms'],
+        style=Pack(height=200)
+    )
+    status = toga.Label('', style=Pack(font_size=12, padding_left=10))
+
+    def dump(widget):
+        path = os.path.join(str(app.paths.data), f"timings-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            instrumentation.dump_json(path)
+            status.text = f"Saved {path}"
+        except OSError as e:
+            logger.exception('Error writing timings: %s', e)
+            status.text = f"Could not save timings: {e}"
+
+    buttons = toga.Box(style=Pack(direction=ROW, padding_top=5))
+    buttons.add(toga.Button('Refresh Timings', on_press=lambda w: show_timings(table), style=Pack(color=TEXT_COLOR)))
+    buttons.add(toga.Button('Dump to JSON', on_press=dump, style=Pack(color=TEXT_COLOR)))
+    buttons.add(status)
+    section.add(table)
+    section.add(buttons)
+    show_timings(table)
+    return section
+
+def create_slow_queries_section(slow_queries):
+    """Create a table of the most recent slow statements and their query plans, or a hint when the recorder is off."""
+    section = toga.Box(style=Pack(direction=COLUMN, padding_bottom=10))
+    if slow_queries is None:
+        section.add(toga.Label(
+            f'Slow queries: recorder is off (set PERFTRACKER_SLOW_QUERY_MS={DEFAULT_THRESHOLD_MS} to enable)',
+            style=Pack(font_size=12)
+        ))
+        return section
+    entries = slow_queries.entries()
+    section.add(toga.Label(
+        f"Slow queries (>= {slow_queries.threshold_ms}ms): {len(entries)} recorded",
+        style=Pack(font_size=12, padding_bottom=5)
+    ))
+    if entries:
+        table = toga.Table(headings=['Time', 'ms', 'Rows', 'SQL', 'Plan'], style=Pack(height=150))
+        table.data = [
+            (entry['time'][11:], f"{entry['duration_ms']:.1f}", entry['rows'], entry['sql'], '; '.join(entry['plan']))
+            for entry in reversed(entries)
+        ]
+        section.add(table)
+    return section
+
+def show_timings(table):
+    """Fill the timings table from the current histograms."""
+    table.data = [
+        (
+            name, summary['count'],
+            f"{summary['p50_ms']:.1f}", f"{summary['p95_ms']:.1f}",
+            f"{summary['p99_ms']:.1f}", f"{summary['max_ms']:.1f}"
+        )
+        for name, summary in instrumentation.snapshot().items()
+    ]
+
+def show_logs(filters, table):
+    """Fill the log table with the records matching the current filters."""
+    level = filters['level'].value
+    records = query_logs(
+        level=None if level == 'ALL' else level,
+        since=TIME_WINDOWS[filters['window'].value],
+        contains=filters['contains'].value.strip() or None,
+        limit=MAX_ROWS
+    )
+    # Newest first; messages are formatted only for the rows that match
+    table.data = [
+        (
+            datetime.fromtimestamp(record.created).strftime('%H:%M:%S'),
+            record.levelname,
+            record.name,
+            record.getMessage()
+        )
+        for record in reversed(records)
+    ]
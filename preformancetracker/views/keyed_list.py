@@ -0,0 +1,49 @@
+class KeyedList:
+    """Shows a list of items as cards in a box, reusing card widgets between updates.
+
+    Each item is matched to the card that showed the same key last time, so an
+    update only changes label text and style in place. Cards for keys that
+    disappear are detached and kept in a small pool for reuse, and new cards
+    are only created when the pool is empty.
+
+    card_factory() must return an object with a `widget` attribute (the toga
+    widget added to the box) and an `update(item)` method.
+    """
+    def __init__(self, box, card_factory, pool_size=10):
+        self.box = box
+        self.card_factory = card_factory
+        self.pool_size = pool_size
+        self._cards = {}
+        self._pool = []
+        self.created = 0
+
+    def update(self, items, key):
+        """Show items in order, keyed by key(item)."""
+        keyed = [(key(item), item) for item in items]
+        wanted = {k for k, _ in keyed}
+
+        for k in [k for k in self._cards if k not in wanted]:
+            card = self._cards.pop(k)
+            self.box.remove(card.widget)
+            if len(self._pool) < self.pool_size:
+                self._pool.append(card)
+
+        for index, (k, item) in enumerate(keyed):
+            card = self._cards.get(k)
+            if card is None:
+                card = self._take_card()
+                self._cards[k] = card
+            card.update(item)
+            children = self.box.children
+            if index < len(children) and children[index] is card.widget:
+                continue
+            if card.widget in children:
+                self.box.remove(card.widget)
+            self.box.insert(index, card.widget)
+
+    def _take_card(self):
+        """Reuse a pooled card or create a new one."""
+        if self._pool:
+            return self._pool.pop()
+        self.created += 1
+        return self.card_factory()
@@ -1,12 +1,21 @@
+import asyncio
 import toga
 from toga.style import Pack
 from toga.style.pack import COLUMN, ROW
 from datetime import datetime
+from ..debug import logger
 from ..styles import (
     CONTENT_STYLE, SCROLL_CONTAINER_STYLE, H2_STYLE, 
     LABEL_STYLE, CARD_STYLE, TEXT_COLOR, SUCCESS_COLOR, ERROR_COLOR
 )
 
+PAGE_SIZE = 50
+# Load the next page once the user scrolls within this many pixels of the end.
+LOAD_MORE_THRESHOLD = 200
+# Wait this long after the last keystroke before searching.
+SEARCH_DELAY = 0.3
+SEARCH_LIMIT = 100
+
 def create(app):
     container = toga.ScrollContainer(style=SCROLL_CONTAINER_STYLE)
     content = toga.Box(style=CONTENT_STYLE)
@@ -23,42 +32,190 @@ def create(app):
     header.add(title)
     content.add(header)
 
-    # Records Table
-    table = toga.Table(
-        headings=['Task', 'Time', 'Performance', 'Actions'],
-        style=Pack(flex=1, background_color=CARD_STYLE.background_color)
+    # Export
+    export_box = toga.Box(style=Pack(direction=ROW, padding_bottom=10))
+    export_status = toga.Label('', style=Pack(flex=1, font_size=12, color=TEXT_COLOR))
+    export_box.add(toga.Button(
+        '⬇️ Export CSV',
+        on_press=lambda w: asyncio.ensure_future(app.export_records_async(export_status)),
+        style=Pack(padding=5, margin_right=10, color=TEXT_COLOR)
+    ))
+    export_box.add(export_status)
+    content.add(export_box)
+
+    # Search
+    search_input = toga.TextInput(
+        placeholder='Search tasks and delay notes',
+        on_change=lambda w: _on_search_change(app, state, w.value),
+        style=Pack(flex=1, padding_bottom=10)
     )
+    content.add(search_input)
+
+    # Records List
+    records_box = toga.Box(style=Pack(direction=COLUMN, flex=1))
+    content.add(records_box)
+
+    state = {'records_box': records_box, 'cursor': None, 'done': False, 'loading': False,
+             'query': '', 'search_task': None,
+             # Bumped whenever the list is reset, so results of older loads are dropped.
+             'generation': 0}
+    load_more_button = toga.Button(
+        'Load more',
+        on_press=lambda w: load_next_page(app, state),
+        style=Pack(padding=10, margin=5, color=TEXT_COLOR)
+    )
+    state['load_more_button'] = load_more_button
+    content.add(load_more_button)
 
-    # Load records
-    records = app.db.get_recent_records()
-    for record in records:
-        row = [
-            record['task_name'],
-            f"{record['start_time']} - {record['end_time']}",
-            f"{record['performance_percentage']:.1f}%",
-            toga.Box(style=Pack(direction=ROW))
-        ]
-        
-        # Add action buttons
-        actions_box = toga.Box(style=Pack(direction=ROW))
-        
-        edit_button = toga.Button(
-            '✏️ Edit',
-            on_press=lambda w, r=record['id']: app.set_view('add_record', record_id=r),
-            style=Pack(padding=5, margin=2, background_color=SUCCESS_COLOR, color='white')
-        )
-        actions_box.add(edit_button)
-        
-        delete_button = toga.Button(
-            '🗑️ Delete',
-            on_press=lambda w, r=record['id']: app.delete_record_async(r),
-            style=Pack(padding=5, margin=2, background_color=ERROR_COLOR, color='white')
-        )
-        actions_box.add(delete_button)
-        
-        row[3] = actions_box
-        table.data.append(row)
-
-    content.add(table)
     container.content = content
-    return container 
\ No newline at end of file
+    container.on_scroll = lambda w: _on_scroll(app, state, w)
+    container.records_state = state
+
+    # Load the first page
+    load_next_page(app, state)
+    return container
+
+def refresh(app, container):
+    """Reload a cached records view from the first page, or rerun its search."""
+    state = container.records_state
+    if state['query']:
+        _start_search(app, state, delay=0)
+        return
+    if state['loading']:
+        return
+    _reset_pages(app, state)
+
+def _reset_pages(app, state):
+    """Clear the list and load the first page of records."""
+    state['generation'] += 1
+    state['loading'] = False
+    state['records_box'].clear()
+    state['cursor'] = None
+    state['done'] = False
+    state['load_more_button'].enabled = True
+    load_next_page(app, state)
+
+def _on_scroll(app, state, container):
+    """Load the next page when the user nears the end of the list."""
+    if container.max_vertical_position - container.vertical_position <= LOAD_MORE_THRESHOLD:
+        load_next_page(app, state)
+
+def load_next_page(app, state):
+    """Start loading the next page of records in the background."""
+    if state['done'] or state['loading']:
+        return
+    state['loading'] = True
+    app.loop.create_task(_load_next_page(app, state, state['generation'], state['cursor']))
+
+async def _load_next_page(app, state, generation, cursor):
+    """Fetch the page after cursor and append it to the list, unless the list has been reset since."""
+    try:
+        records, cursor = await app.adb.get_records_page(cursor=cursor, limit=PAGE_SIZE)
+        if generation != state['generation']:
+            # The list was reset or replaced by a search while this page loaded.
+            return
+        state['cursor'] = cursor
+        for record in records:
+            state['records_box'].add(_create_record_row(app, record))
+        if state['cursor'] is None:
+            state['done'] = True
+            state['load_more_button'].enabled = False
+            if not state['records_box'].children:
+                state['records_box'].add(toga.Label(
+                    "No records yet.",
+                    style=Pack(padding=10, font_style='italic', text_align='center', color=TEXT_COLOR)
+                ))
+    finally:
+        if generation == state['generation']:
+            state['loading'] = False
+
+def _on_search_change(app, state, value):
+    """Search as the user types; clearing the box goes back to the paged list."""
+    query = value.strip()
+    if query == state['query']:
+        return
+    state['query'] = query
+    if query:
+        _start_search(app, state)
+    else:
+        if state['search_task'] is not None:
+            state['search_task'].cancel()
+        _reset_pages(app, state)
+
+def _start_search(app, state, delay=SEARCH_DELAY):
+    """Replace any pending search with one for the current query."""
+    if state['search_task'] is not None:
+        state['search_task'].cancel()
+    state['generation'] += 1
+    state['loading'] = False
+    state['done'] = True
+    state['load_more_button'].enabled = False
+    state['search_task'] = app.loop.create_task(_search(app, state, state['query'], delay, state['generation']))
+
+async def _search(app, state, query, delay, generation):
+    """Show the best matches for query once the user has stopped typing."""
+    await asyncio.sleep(delay)
+    try:
+        records = await app.adb.search_records(query, limit=SEARCH_LIMIT)
+    except Exception as e:
+        logger.error(f"Search for {query!r} failed: {e}")
+        if generation == state['generation']:
+            state['records_box'].clear()
+            state['records_box'].add(toga.Label(
+                "Search failed. Please try again.",
+                style=Pack(padding=10, font_style='italic', text_align='center', color=ERROR_COLOR)
+            ))
+        return
+    if generation != state['generation']:
+        return
+    state['records_box'].clear()
+    for record in records:
+        state['records_box'].add(_create_record_row(app, record))
+    if not records:
+        state['records_box'].add(toga.Label(
+            f"No records match \"{query}\".",
+            style=Pack(padding=10, font_style='italic', text_align='center', color=TEXT_COLOR)
+        ))
+
+def _create_record_row(app, record):
+    """Create the row for a single record."""
+    row = toga.Box(style=Pack(
+        direction=ROW,
+        padding=10,
+        margin_bottom=5,
+        background_color=CARD_STYLE.background_color
+    ))
+
+    details = toga.Box(style=Pack(direction=COLUMN, flex=1))
+    details.add(toga.Label(record['task_name'], style=Pack(font_weight='bold', color=TEXT_COLOR)))
+    details.add(toga.Label(
+        f"{record['work_date']}  {record['start_time']} - {record['end_time']}",
+        style=Pack(font_size=12, color=TEXT_COLOR)
+    ))
+    details.add(toga.Label(
+        f"{record['performance_percentage']:.1f}%",
+        style=Pack(color=SUCCESS_COLOR if record['performance_percentage'] >= 100 else ERROR_COLOR)
+    ))
+    if record.get('snippet') and record.get('delay_notes'):
+        details.add(toga.Label(record['snippet'], style=Pack(font_size=12, color=TEXT_COLOR)))
+    row.add(details)
+
+    # Add action buttons
+    actions_box = toga.Box(style=Pack(direction=ROW))
+
+    edit_button = toga.Button(
+        '✏️ Edit',
+        on_press=lambda w, r=record['id']: app.set_view('add_record', record_id=r),
+        style=Pack(padding=5, margin=2, background_color=SUCCESS_COLOR, color='white')
+    )
+    actions_box.add(edit_button)
+
+    delete_button = toga.Button(
+        '🗑️ Delete',
+        on_press=lambda w, r=record['id']: asyncio.ensure_future(app.delete_record_async(r)),
+        style=Pack(padding=5, margin=2, background_color=ERROR_COLOR, color='white')
+    )
+    actions_box.add(delete_button)
+
+    row.add(actions_box)
+    return row
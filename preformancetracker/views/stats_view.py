@@ -2,11 +2,15 @@ import toga
 from toga.style import Pack
 from toga.style.pack import COLUMN, ROW
 from datetime import datetime, timedelta
+from ..database import TREND_WINDOWS
 from ..styles import (
     CONTENT_STYLE, SCROLL_CONTAINER_STYLE, H2_STYLE, 
     LABEL_STYLE, CARD_STYLE, TEXT_COLOR
 )
 
+# Days of trends to load; the rolling windows look back further on their own.
+TREND_DAYS = 30
+
 def create(app):
     container = toga.ScrollContainer(style=SCROLL_CONTAINER_STYLE)
     content = toga.Box(style=CONTENT_STYLE)
@@ -26,40 +30,21 @@ def create(app):
     # Daily Stats Card
     daily_box = toga.Box(style=CARD_STYLE)
     daily_box.add(toga.Label('Today\'s Performance', style=H2_STYLE))
-    
-    daily_stats = app.db.get_daily_stats()
-    stats = [
-        f"Average Performance: {daily_stats['avg_performance']:.1f}%",
-        f"Total Records: {daily_stats['total_records']}",
-        f"Total Time: {daily_stats['total_time']:.1f} minutes",
-        f"Break Time: {daily_stats['total_break_time']:.1f} minutes",
-        f"Delay Time: {daily_stats['total_delay_time']:.1f} minutes",
-        f"Best Performance: {daily_stats['best_performance']:.1f}%",
-        f"Worst Performance: {daily_stats['worst_performance']:.1f}%"
-    ]
-    for stat in stats:
-        daily_box.add(toga.Label(stat, style=LABEL_STYLE))
+    daily_labels = _add_placeholders(daily_box, 8)
     content.add(daily_box)
 
     # Weekly Stats Card
     weekly_box = toga.Box(style=CARD_STYLE)
     weekly_box.add(toga.Label('This Week\'s Performance', style=H2_STYLE))
-    
-    weekly_stats = app.db.get_weekly_stats()
-    stats = [
-        f"Average Performance: {weekly_stats['avg_performance']:.1f}%",
-        f"Total Records: {weekly_stats['total_records']}",
-        f"Total Time: {weekly_stats['total_time']:.1f} minutes",
-        f"Break Time: {weekly_stats['total_break_time']:.1f} minutes",
-        f"Delay Time: {weekly_stats['total_delay_time']:.1f} minutes",
-        f"Active Days: {weekly_stats['active_days']}",
-        f"Best Performance: {weekly_stats['best_performance']:.1f}%",
-        f"Worst Performance: {weekly_stats['worst_performance']:.1f}%"
-    ]
-    for stat in stats:
-        weekly_box.add(toga.Label(stat, style=LABEL_STYLE))
+    weekly_labels = _add_placeholders(weekly_box, 9)
     content.add(weekly_box)
 
+    # Trends Card
+    trends_box = toga.Box(style=CARD_STYLE)
+    trends_box.add(toga.Label('Trends', style=H2_STYLE))
+    trend_labels = _add_placeholders(trends_box, 5)
+    content.add(trends_box)
+
     # Navigation Buttons
     nav_box = toga.Box(style=Pack(direction=ROW, padding_top=20))
     
@@ -79,4 +64,66 @@ def create(app):
     
     content.add(nav_box)
     container.content = content
-    return container 
\ No newline at end of file
+
+    # Fill in the cards once the queries finish
+    container.stats_labels = (daily_labels, weekly_labels, trend_labels)
+    refresh(app, container)
+    return container
+
+def refresh(app, container):
+    """Reload the stats shown in a statistics view."""
+    app.loop.create_task(load_stats(app, *container.stats_labels))
+
+def _add_placeholders(box, count):
+    """Add count placeholder labels to a card and return them."""
+    labels = [toga.Label('Loading...' if i == 0 else '', style=LABEL_STYLE) for i in range(count)]
+    for label in labels:
+        box.add(label)
+    return labels
+
+def _show(labels, lines):
+    """Put lines of text into the given labels."""
+    for label, line in zip(labels, lines):
+        label.text = line
+
+async def load_stats(app, daily_labels, weekly_labels, trend_labels):
+    """Load today's, this week's and the trend stats in the background and show them."""
+    daily_stats = await app.adb.get_daily_stats()
+    _show(daily_labels, [
+        f"Average Performance: {daily_stats['avg_performance']:.1f}%",
+        f"Median Performance: {daily_stats['median_performance']:.1f}% (90th percentile {daily_stats['p90_performance']:.1f}%)",
+        f"Total Records: {daily_stats['total_records']}",
+        f"Total Time: {daily_stats['total_time']:.1f} minutes",
+        f"Break Time: {daily_stats['total_break_time']:.1f} minutes",
+        f"Delay Time: {daily_stats['total_delay_time']:.1f} minutes",
+        f"Best Performance: {daily_stats['best_performance']:.1f}%",
+        f"Worst Performance: {daily_stats['worst_performance']:.1f}%"
+    ])
+
+    weekly_stats = await app.adb.get_weekly_stats()
+    _show(weekly_labels, [
+        f"Average Performance: {weekly_stats['avg_performance']:.1f}%",
+        f"Median Performance: {weekly_stats['median_performance']:.1f}% (90th percentile {weekly_stats['p90_performance']:.1f}%)",
+        f"Total Records: {weekly_stats['total_records']}",
+        f"Total Time: {weekly_stats['total_time']:.1f} minutes",
+        f"Break Time: {weekly_stats['total_break_time']:.1f} minutes",
+        f"Delay Time: {weekly_stats['total_delay_time']:.1f} minutes",
+        f"Active Days: {weekly_stats['active_days']}",
+        f"Best Performance: {weekly_stats['best_performance']:.1f}%",
+        f"Worst Performance: {weekly_stats['worst_performance']:.1f}%"
+    ])
+
+    today = datetime.now()
+    trends = await app.adb.get_trends(today - timedelta(days=TREND_DAYS), today)
+    if not trends:
+        _show(trend_labels, [f"No records in the last {TREND_DAYS} days"] + [''] * 4)
+        return
+    latest = trends[-1]
+    change = latest['day_change']
+    _show(trend_labels, [f"As of {latest['work_date']}:"] + [
+        f"{days}-day average: {latest[f'avg_performance_{days}d']:.1f}% "
+        f"(delays {(latest[f'delay_share_{days}d'] or 0) * 100:.1f}% of work time)"
+        for days in TREND_WINDOWS
+    ] + [
+        f"Change since previous day: {change:+.1f} points" if change is not None else 'Change since previous day: -'
+    ])
@@ -2,10 +2,33 @@ import toga
 from toga.style import Pack
 from toga.style.pack import COLUMN, ROW
 from datetime import datetime, timedelta
+from ..database import combine_stats
 from ..styles import (
     CONTENT_STYLE, SCROLL_CONTAINER_STYLE, H2_STYLE, LABEL_STYLE,
     CARD_STYLE, TEXT_COLOR, SUCCESS_COLOR, ERROR_COLOR
 )
+from .keyed_list import KeyedList
+
+class DayCard:
+    """Card summarising one day of the week, updated in place when reused."""
+    def __init__(self):
+        # Day Header
+        self.day_label = toga.Label('', style=Pack(font_size=14, font_weight='bold', padding_bottom=5, color=TEXT_COLOR))
+        # Performance
+        self.performance_label = toga.Label('', style=Pack(font_size=12, padding_bottom=5))
+        # Records and Time
+        self.totals_label = toga.Label('', style=Pack(font_size=12, color=TEXT_COLOR))
+        self.widget = toga.Box(
+            style=Pack(direction=COLUMN, padding=10, background_color='#ffffff', margin_bottom=5),
+            children=[self.day_label, self.performance_label, self.totals_label]
+        )
+
+    def update(self, day):
+        date, day_stats = day
+        self.day_label.text = date.strftime("%A, %B %d")
+        self.performance_label.text = f"Performance: {day_stats['avg_performance']:.1f}%"
+        self.performance_label.style.color = SUCCESS_COLOR if day_stats['avg_performance'] >= 100 else ERROR_COLOR
+        self.totals_label.text = f"Records: {day_stats['total_records']} | Time: {day_stats['total_time']:.1f} min"
 
 def create(app):
     """Create the weekly view."""
@@ -31,7 +54,7 @@ def create(app):
     
     prev_week_btn = toga.Button(
         "◀ Previous",
-        on_press=lambda w: update_week(app, container, -1),
+        on_press=lambda w: update_week(app, content_box, content_box.week_offset - 1),
         style=Pack(padding=5, color=TEXT_COLOR)
     )
     nav_box.add(prev_week_btn)
@@ -44,7 +67,7 @@ def create(app):
     
     next_week_btn = toga.Button(
         "Next ▶",
-        on_press=lambda w: update_week(app, container, 1),
+        on_press=lambda w: update_week(app, content_box, content_box.week_offset + 1),
         style=Pack(padding=5, color=TEXT_COLOR)
     )
     nav_box.add(next_week_btn)
@@ -53,94 +76,92 @@ def create(app):
 
     # Content Area
     content_box = toga.Box(style=Pack(direction=COLUMN))
+    content_box.week_offset = 0
+    content_box.week_label = week_label
+
+    content_box.status_label = toga.Label(
+        "Loading...",
+        style=Pack(padding=10, font_style='italic', text_align='center', color=TEXT_COLOR)
+    )
+    content_box.add(content_box.status_label)
+
+    # Summary Box
+    content_box.summary_labels = [
+        toga.Label('', style=Pack(font_size=16, padding_bottom=5)),
+        toga.Label('', style=Pack(font_size=14, padding_bottom=5, color=TEXT_COLOR)),
+        toga.Label('', style=Pack(font_size=14, color=TEXT_COLOR)),
+    ]
+    content_box.add(toga.Box(
+        style=Pack(
+            direction=COLUMN,
+            padding=10,
+            background_color=CARD_STYLE.background_color,
+            margin_bottom=10
+        ),
+        children=content_box.summary_labels
+    ))
+
+    # Daily Breakdown
+    days_box = toga.Box(style=Pack(direction=COLUMN))
+    content_box.days = KeyedList(days_box, DayCard)
+    content_box.add(days_box)
     container.add(content_box)
 
     # Initial week display
     update_week(app, content_box, 0)
 
     scroll_container.content = container
+    scroll_container.content_box = content_box
     return scroll_container
 
+def refresh(app, scroll_container):
+    """Reload the data shown in a cached weekly view."""
+    content_box = scroll_container.content_box
+    update_week(app, content_box, content_box.week_offset)
+
+def get_start_of_week(week_offset):
+    """Get the Monday of the week week_offset weeks from the current one."""
+    today = datetime.now()
+    return today - timedelta(days=today.weekday()) + timedelta(weeks=week_offset)
+
 def get_week_range(week_offset):
     """Get the date range for the specified week offset."""
-    today = datetime.now()
-    start_of_week = today - timedelta(days=today.weekday() + (7 * week_offset))
+    start_of_week = get_start_of_week(week_offset)
     end_of_week = start_of_week + timedelta(days=6)
     return f"{start_of_week.strftime('%b %d')} - {end_of_week.strftime('%b %d, %Y')}"
 
 def update_week(app, container, week_offset):
-    """Update the weekly view based on the selected week."""
-    # Clear existing content
-    container.clear()
+    """Switch to the selected week and load its data in the background."""
+    container.week_offset = week_offset
+    container.week_label.text = get_week_range(week_offset)
+    container.status_label.text = "Loading..."
+    container.status_label.style.display = 'pack'
+    app.loop.create_task(_load_week(app, container, week_offset))
 
+async def _load_week(app, container, week_offset):
+    """Update the weekly view based on the selected week."""
     # Calculate week dates
-    today = datetime.now()
-    start_of_week = today - timedelta(days=today.weekday() + (7 * week_offset))
-    
-    # Get weekly stats
-    stats = app.db.get_weekly_stats(start_of_week)
-    
-    # Summary Box
-    summary_box = toga.Box(style=Pack(
-        direction=COLUMN,
-        padding=10,
-        background_color=CARD_STYLE['background_color'],
-        border_radius=5,
-        margin_bottom=10
-    ))
-    
-    # Average Performance
-    perf_color = SUCCESS_COLOR if stats['avg_performance'] >= 100 else ERROR_COLOR
-    summary_box.add(toga.Label(
-        f"Weekly Average: {stats['avg_performance']:.1f}%",
-        style=Pack(font_size=16, color=perf_color, padding_bottom=5)
-    ))
+    start_of_week = get_start_of_week(week_offset)
     
-    # Total Records
-    summary_box.add(toga.Label(
-        f"Total Records: {stats['total_records']}",
-        style=Pack(font_size=14, padding_bottom=5, color=TEXT_COLOR)
-    ))
-    
-    # Total Time
-    summary_box.add(toga.Label(
-        f"Total Work Time: {stats['total_time']:.1f} minutes",
-        style=Pack(font_size=14, color=TEXT_COLOR)
-    ))
-    
-    container.add(summary_box)
+    # Get daily stats for the whole week in one query
+    week_stats = await app.adb.get_grouped_stats(start_of_week, start_of_week + timedelta(days=6))
+    stats = combine_stats(week_stats.values())
 
-    # Daily Breakdown
+    # Ignore results for a week the user has already paged away from
+    if container.week_offset != week_offset:
+        return
+    container.status_label.style.display = 'none'
+
+    # Average Performance, Total Records, Total Time
+    average_label, records_label, time_label = container.summary_labels
+    average_label.text = f"Weekly Average: {stats['avg_performance']:.1f}%"
+    average_label.style.color = SUCCESS_COLOR if stats['avg_performance'] >= 100 else ERROR_COLOR
+    records_label.text = f"Total Records: {stats['total_records']}"
+    time_label.text = f"Total Work Time: {stats['total_time']:.1f} minutes"
+
+    # Daily Breakdown: every weekday gets a card, with zeros on days without records
+    days = []
     for day_offset in range(7):
         date = start_of_week + timedelta(days=day_offset)
-        day_stats = app.db.get_daily_stats(date)
-        
-        if day_stats:
-            day_box = toga.Box(style=Pack(
-                direction=COLUMN,
-                padding=10,
-                background_color='#ffffff',
-                border_radius=5,
-                margin_bottom=5
-            ))
-            
-            # Day Header
-            day_box.add(toga.Label(
-                date.strftime("%A, %B %d"),
-                style=Pack(font_size=14, font_weight='bold', padding_bottom=5, color=TEXT_COLOR)
-            ))
-            
-            # Performance
-            perf_color = SUCCESS_COLOR if day_stats['avg_performance'] >= 100 else ERROR_COLOR
-            day_box.add(toga.Label(
-                f"Performance: {day_stats['avg_performance']:.1f}%",
-                style=Pack(font_size=12, color=perf_color, padding_bottom=5)
-            ))
-            
-            # Records and Time
-            day_box.add(toga.Label(
-                f"Records: {day_stats['total_records']} | Time: {day_stats['total_time']:.1f} min",
-                style=Pack(font_size=12, color=TEXT_COLOR)
-            ))
-            
-            container.add(day_box) 
\ No newline at end of file
+        days.append((date, week_stats.get(date.strftime('%Y-%m-%d')) or combine_stats([])))
+    container.days.update(days, key=lambda day: day[0].weekday())
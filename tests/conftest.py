@@ -0,0 +1,63 @@
+import pytest
+from preformancetracker.database import ROLLUP_COLUMNS, ROLLUP_SELECT, Database, _bucket_sql
+
+def make_record(**overrides):
+    """Return record data as the add-record form saves it."""
+    record = {
+        'task_name': 'Pick Aisle A', 'target_time': 45, 'actual_time': 45,
+        'performance_percentage': 100.0, 'start_time': '09:00', 'end_time': '09:45',
+        'break_time': 0, 'has_break': False, 'delays_time': 0, 'has_delays': False,
+        'delay_notes': '', 'skill': 'Picker', 'paid_break_time': 0, 'unpaid_break_time': 0,
+    }
+    record.update(overrides)
+    return record
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'performance.db')
+
+@pytest.fixture
+def db(db_path):
+    database = Database(db_path=db_path, slow_query_ms=None)
+    yield database
+    database.close()
+
+def rollups_from_raw(conn):
+    """daily_rollups as a recompute from performance_records would produce it."""
+    return conn.execute(f'''
+        {ROLLUP_SELECT} WHERE work_date IS NOT NULL GROUP BY work_date ORDER BY work_date
+    ''').fetchall()
+
+def stored_rollups(conn):
+    return conn.execute(f'SELECT {ROLLUP_COLUMNS} FROM daily_rollups ORDER BY work_date').fetchall()
+
+def histogram_from_raw(conn):
+    return conn.execute(f'''
+        SELECT work_date, task_id, {_bucket_sql('performance_percentage')} AS bucket, COUNT(*),
+               MIN(performance_percentage), MAX(performance_percentage)
+        FROM performance_records
+        WHERE work_date IS NOT NULL
+        GROUP BY work_date, task_id, bucket
+        ORDER BY work_date, task_id, bucket
+    ''').fetchall()
+
+def stored_histogram(conn):
+    return conn.execute('''
+        SELECT work_date, task_id, bucket, count, min_value, max_value FROM performance_histogram
+        ORDER BY work_date, task_id, bucket
+    ''').fetchall()
+
+def assert_histogram_matches_raw(conn):
+    assert stored_histogram(conn) == histogram_from_raw(conn)
+
+def assert_rollups_match_raw(conn):
+    """Check daily_rollups against the raw records."""
+    expected, stored = rollups_from_raw(conn), stored_rollups(conn)
+    assert [row[:2] for row in stored] == [row[:2] for row in expected]
+    for stored_row, expected_row in zip(stored, expected):
+        assert stored_row[2:] == pytest.approx(expected_row[2:])
+
+def assert_search_index_intact(conn):
+    """Run the FTS5 integrity check, which fails if record_search is out of step with its content."""
+    with conn:
+        conn.execute("INSERT INTO record_search (record_search, rank) VALUES ('integrity-check', 1)")
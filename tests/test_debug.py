@@ -0,0 +1,14 @@
+from preformancetracker.debug import log_history, logger, query_logs
+
+def test_buffered_exceptions_keep_text_not_tracebacks():
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        logger.exception("Lookup failed for %s", 'aisle 4')
+
+    record = log_history[-1]
+    assert record.exc_info is None and record.exc_text is None and record.args is None
+    message = record.getMessage()
+    assert message.startswith('Lookup failed for aisle 4\nTraceback')
+    assert 'ZeroDivisionError' in message
+    assert query_logs(contains='zerodivisionerror', limit=1) == [record]
@@ -0,0 +1,35 @@
+import json
+from preformancetracker.importer import import_records, read_records_file
+
+def _row(**overrides):
+    row = {'work_date': '2024-03-04', 'task_name': 'Pick Aisle A', 'target_time': 45,
+           'start_time': '09:00', 'end_time': '09:45'}
+    row.update(overrides)
+    return row
+
+def test_malformed_jsonl_line_is_reported_and_skipped(db, tmp_path):
+    path = tmp_path / 'records.jsonl'
+    path.write_text('\n'.join([
+        json.dumps(_row()),
+        '{"work_date": "2024-03-04", "task_name": ',
+        json.dumps(_row(start_time='10:00', end_time='10:30')),
+    ]) + '\n', encoding='utf-8')
+
+    result = import_records(db, read_records_file(str(path)))
+
+    assert result['inserted'] == 2
+    assert result['errors'] == [(2, 'invalid JSON')]
+    assert db.count_records() == 2
+
+def test_invalid_rows_do_not_abort_the_batch(db):
+    result = import_records(db, [_row(), _row(target_time='fast'), _row(task_name='')])
+    assert result['inserted'] == 1
+    assert [row for row, _ in result['errors']] == [2, 3]
+
+def test_unpadded_dates_and_times_are_stored_padded(db):
+    result = import_records(db, [_row(work_date='2024-3-4', start_time='9:00', end_time='9:45')])
+    assert result == {'inserted': 1, 'errors': []}
+
+    record = db.get_recent_records(1)[0]
+    assert (record['work_date'], record['start_time'], record['end_time']) == ('2024-03-04', '09:00', '09:45')
+    assert db.get_stats_for_date_range('2024-03-01', '2024-03-31')['total_records'] == 1
@@ -0,0 +1,43 @@
+import pytest
+from preformancetracker import metrics
+from preformancetracker.metrics import calculate_metrics, calculate_metrics_batch, recompute_metrics
+
+def test_battery_changes_do_not_change_the_default_formula():
+    # target / (actual - delays): 60 / (70 - 10)
+    result = calculate_metrics('09:00', '10:10', 60, delays_time=10, has_delays=True, battery_count=2)
+    assert result['performance_percentage'] == pytest.approx(100.0)
+
+def test_battery_credit_is_opt_in():
+    result = calculate_metrics('09:00', '10:18', 60, battery_count=2, battery_credit=True)
+    assert result['performance_percentage'] == pytest.approx(100.0)
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+@pytest.mark.parametrize('battery_credit', [False, True])
+def test_batch_matches_scalar(monkeypatch, use_numpy, battery_credit):
+    if use_numpy and metrics._numpy() is None:
+        pytest.skip('numpy is not installed')
+    if not use_numpy:
+        monkeypatch.setattr(metrics, '_numpy', lambda: None)
+    records = [
+        {'start_time': '09:00', 'end_time': '09:50', 'target_time': 45, 'has_break': False,
+         'delays_time': 5, 'has_delays': True, 'battery_changes_count': 1},
+        {'start_time': '23:30', 'end_time': '00:40', 'target_time': 30, 'has_break': True,
+         'break_time': 15, 'delays_time': 0, 'has_delays': False, 'battery_changes_count': 0},
+    ]
+    batch = calculate_metrics_batch(records, battery_credit=battery_credit)
+    for index, record in enumerate(records):
+        scalar = calculate_metrics(**metrics.metric_inputs(record), battery_credit=battery_credit)
+        for field, value in scalar.items():
+            assert batch[field][index] == pytest.approx(value)
+
+def test_recompute_keeps_insert_record_breaks(db):
+    form = {
+        'task_name': 'Pick Chilled', 'target_time': 75, 'start_time': '09:00', 'finish_time': '10:45',
+        'break_type': 'lunch', 'delays_time': 0, 'has_delays': False, 'delay_notes': '',
+        'battery_count': 0, 'paid_break_time': 0, 'unpaid_break_time': 0,
+    }
+    db.insert_record(form, {'actual_work_time': 75, 'performance': 100.0}).result(5)
+    before = db.get_recent_records(1)[0]
+    assert recompute_metrics(db) == (1, 0)
+    after = db.get_record_by_id(before['id'])
+    assert (after['actual_time'], after['break_time'], after['performance_percentage']) == (75, 30, 100.0)
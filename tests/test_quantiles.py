@@ -0,0 +1,77 @@
+import sqlite3
+from datetime import datetime
+from preformancetracker.quantiles import QuantileSketch
+from .conftest import assert_histogram_matches_raw, make_record
+
+def test_quantiles_are_clamped_to_observed_values():
+    sketch = QuantileSketch()
+    for value in (100.0, 100.0, 100.0):
+        sketch.add(value)
+    assert sketch.quantile(0.5) == 100.0
+
+    single = QuantileSketch()
+    single.add(120.0)
+    assert single.summary()['median_performance'] == 120.0
+    assert single.summary()['p90_performance'] == 120.0
+
+def test_bins_without_bounds_report_their_midpoint():
+    assert QuantileSketch({100: 3}).quantile(0.5) == 100.5
+
+def test_merge_keeps_bounds():
+    first, second = QuantileSketch(), QuantileSketch()
+    first.add(100.2)
+    second.add(100.7)
+    merged = QuantileSketch().merge(first).merge(second)
+    assert merged.bounds[100] == (100.2, 100.7)
+    assert merged.quantile(0.5) == 100.5
+    assert merged.quantile(0) == 100.5
+
+def test_daily_percentiles_follow_deletes(db):
+    for performance in (100.0, 100.0, 100.8):
+        db.save_record(make_record(performance_percentage=performance))
+    today = datetime.now()
+    # Distinct values share the bin, so the midpoint stands until the highest one goes.
+    assert db.get_daily_stats(today)['median_performance'] == 100.5
+    highest = max(db.get_recent_records(3), key=lambda r: r['performance_percentage'])
+    db.delete_record(highest['id'])
+    stats = db.get_daily_stats(today)
+    assert stats['median_performance'] == 100.0
+    assert stats['p90_performance'] == 100.0
+
+def test_histogram_follows_inserts_updates_and_deletes(db):
+    db.insert_records_bulk([
+        make_record(work_date=day, created_at=f"{day} 09:00:00", performance_percentage=p, **task)
+        for day, p, task in [
+            ('2024-03-04', 95.5, {}),
+            ('2024-03-04', 95.9, {}),
+            ('2024-03-04', 120.0, {'task_name': 'Pick Frozen', 'target_time': 25}),
+            ('2024-03-05', 100.0, {}),
+            ('2024-03-06', 600.0, {}),
+        ]
+    ])
+    conn = sqlite3.connect(db.db_path)
+    try:
+        assert_histogram_matches_raw(conn)
+        ids = [row[0] for row in conn.execute('SELECT id FROM performance_records ORDER BY id')]
+
+        # Update: new task and a new bin.
+        record = db.get_record_by_id(ids[0])
+        record.update(task_name='Returns', target_time=40, performance_percentage=130.0)
+        db.save_record(record, ids[0])
+        assert_histogram_matches_raw(conn)
+
+        # Update that moves a record to another day.
+        with conn:
+            conn.execute("UPDATE performance_records SET work_date = '2024-03-06' WHERE id = ?", (ids[3],))
+        assert_histogram_matches_raw(conn)
+
+        # Deletes, including the lowest value of a shared bin.
+        db.delete_record(ids[1])
+        db.delete_record(ids[4])
+        assert_histogram_matches_raw(conn)
+
+        before = conn.execute('SELECT * FROM performance_histogram ORDER BY work_date, task_id, bucket').fetchall()
+        db.rebuild_rollups()
+        assert conn.execute('SELECT * FROM performance_histogram ORDER BY work_date, task_id, bucket').fetchall() == before
+    finally:
+        conn.close()
@@ -0,0 +1,48 @@
+import sqlite3
+from .conftest import assert_rollups_match_raw, make_record
+
+def _bulk(work_date, **overrides):
+    return make_record(work_date=work_date, created_at=f"{work_date} 09:00:00", **overrides)
+
+def test_rollups_follow_inserts_updates_and_deletes(db):
+    db.insert_records_bulk([
+        _bulk('2024-03-04', performance_percentage=95.5),
+        _bulk('2024-03-04', task_name='Pick Frozen', target_time=25, performance_percentage=120.0),
+        _bulk('2024-03-05', performance_percentage=100.0, actual_time=40),
+        _bulk('2024-03-06', performance_percentage=600.0),
+    ])
+    db.save_record(make_record(performance_percentage=88.0))
+    conn = sqlite3.connect(db.db_path)
+    try:
+        assert_rollups_match_raw(conn)
+        ids = [row[0] for row in conn.execute('SELECT id FROM performance_records ORDER BY id')]
+
+        # Update: new task and performance.
+        record = db.get_record_by_id(ids[0])
+        record.update(task_name='Returns', target_time=40, performance_percentage=130.0)
+        db.save_record(record, ids[0])
+        assert_rollups_match_raw(conn)
+
+        # Update that moves a record to another day.
+        with conn:
+            conn.execute("UPDATE performance_records SET work_date = '2024-03-06' WHERE id = ?", (ids[2],))
+        assert_rollups_match_raw(conn)
+
+        # Deletes, including the last record of a day.
+        db.delete_record(ids[1])
+        db.delete_record(ids[3])
+        assert_rollups_match_raw(conn)
+        assert conn.execute("SELECT COUNT(*) FROM daily_rollups WHERE work_date = '2024-03-05'").fetchone()[0] == 0
+    finally:
+        conn.close()
+
+def test_rebuild_matches_trigger_maintained_rollups(db):
+    db.insert_records_bulk([_bulk('2024-03-04', performance_percentage=p) for p in (80.0, 99.9, 100.0, 101.2)])
+    conn = sqlite3.connect(db.db_path)
+    try:
+        before = conn.execute('SELECT * FROM daily_rollups').fetchall()
+        db.rebuild_rollups()
+        assert conn.execute('SELECT * FROM daily_rollups').fetchall() == before
+        assert_rollups_match_raw(conn)
+    finally:
+        conn.close()
@@ -0,0 +1,70 @@
+import sqlite3
+import pytest
+from preformancetracker.database import search_match_query
+from .conftest import assert_search_index_intact, make_record
+
+def _bulk(work_date, **overrides):
+    return make_record(work_date=work_date, created_at=f"{work_date} 09:00:00", **overrides)
+
+def _search_ids(conn, word):
+    return sorted(row[0] for row in conn.execute(
+        'SELECT rowid FROM record_search WHERE record_search MATCH ?', (f'"{word}"',)
+    ))
+
+def test_index_follows_inserts_updates_and_deletes(db):
+    db.insert_records_bulk([
+        _bulk('2024-03-04', delay_notes='Scanner fault'),
+        _bulk('2024-03-05', delay_notes='Blocked aisle'),
+    ])
+    db.save_record(make_record(task_name='Pick Frozen', target_time=25, delay_notes=None))
+    conn = sqlite3.connect(db.db_path)
+    try:
+        assert_search_index_intact(conn)
+        ids = [row[0] for row in conn.execute('SELECT id FROM performance_records ORDER BY id')]
+
+        # Update: new task and notes.
+        record = db.get_record_by_id(ids[0])
+        record.update(task_name='Returns', target_time=40, delay_notes='Pallet jack')
+        db.save_record(record, ids[0])
+        assert_search_index_intact(conn)
+        assert _search_ids(conn, 'scanner') == []
+        assert _search_ids(conn, 'pallet') == [ids[0]]
+        assert _search_ids(conn, 'returns') == [ids[0]]
+
+        db.delete_record(ids[1])
+        assert_search_index_intact(conn)
+        assert _search_ids(conn, 'blocked') == []
+        assert _search_ids(conn, 'frozen') == [ids[2]]
+    finally:
+        conn.close()
+
+def test_search_ranks_filters_and_highlights(db):
+    db.insert_records_bulk([
+        _bulk('2024-03-04', delay_notes='Waited for a scanner battery'),
+        _bulk('2024-03-05', task_name='Scanner returns', target_time=20, delay_notes=''),
+        _bulk('2024-04-01', delay_notes='Scanner fault'),
+    ])
+    results = db.search_records('scan')
+    # Task name matches weigh more than matches in the notes.
+    assert results[0]['task_name'] == 'Scanner returns'
+    assert len(results) == 3
+    assert all('[scanner]' in r['snippet'].lower() for r in results)
+
+    march = db.search_records('scanner', start_date='2024-03-01', end_date='2024-03-31')
+    assert sorted(r['work_date'] for r in march) == ['2024-03-04', '2024-03-05']
+    # Every word must match.
+    assert [r['work_date'] for r in db.search_records('scanner battery')] == ['2024-03-04']
+
+def test_match_query_quotes_words():
+    assert search_match_query('  ') is None
+    assert search_match_query('blocked "aisle') == '"blocked" "aisle"*'
+    assert search_match_query('NOT near(') == '"NOT" "near("*'
+
+def test_failing_search_raises(db):
+    db.save_record(make_record(delay_notes='Scanner fault'))
+    conn = sqlite3.connect(db.db_path)
+    with conn:
+        conn.execute('DROP TABLE record_search')
+    conn.close()
+    with pytest.raises(sqlite3.OperationalError):
+        db.search_records('scanner')
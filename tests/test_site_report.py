@@ -0,0 +1,41 @@
+import os
+import sqlite3
+from preformancetracker.database import Database
+from preformancetracker.site_report import build_site_report
+from .conftest import make_record
+
+def _worker(path, *performances):
+    db = Database(db_path=str(path), slow_query_ms=None)
+    try:
+        db.insert_records_bulk([
+            make_record(work_date='2024-03-04', created_at='2024-03-04 09:00:00', performance_percentage=p)
+            for p in performances
+        ])
+    finally:
+        db.close()
+
+def test_report_reads_workers_without_changing_other_files(tmp_path):
+    _worker(tmp_path / 'a.db', 90.0, 100.0)
+    _worker(tmp_path / 'b.db', 110.0)
+    (tmp_path / 'c.db').write_bytes(b'')
+    old = sqlite3.connect(tmp_path / 'd.db')
+    with old:
+        old.execute('CREATE TABLE performance_records (id INTEGER PRIMARY KEY)')
+        old.execute('PRAGMA user_version = 3')
+    old.close()
+
+    report = build_site_report(str(tmp_path), '2024-03-01', '2024-03-31', processes=1)
+
+    assert sorted(report['workers']) == ['a', 'b']
+    assert report['total']['total_records'] == 3
+    assert report['failed'] == {
+        'c': 'not a Performance Tracker database',
+        'd': 'schema version 3 is older than 7; open it in the app to upgrade it',
+    }
+    # Neither file was created into or migrated to a tracker database.
+    assert os.path.getsize(tmp_path / 'c.db') == 0
+    old = sqlite3.connect(tmp_path / 'd.db')
+    try:
+        assert old.execute('PRAGMA user_version').fetchone()[0] == 3
+    finally:
+        old.close()
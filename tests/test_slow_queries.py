@@ -0,0 +1,43 @@
+import sqlite3
+from preformancetracker.database import Database
+from preformancetracker.slow_queries import SlowQueryLog, TimedConnection
+from .conftest import make_record
+
+SLOW_QUERY = '''
+    WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 200000)
+    SELECT SUM(i) FROM n
+'''
+
+def test_connection_execute_is_timed():
+    log = SlowQueryLog(threshold_ms=1)
+    conn = sqlite3.connect(':memory:', factory=TimedConnection)
+    conn.slow_queries = log
+    try:
+        assert conn.execute(SLOW_QUERY).fetchone()[0] == 200000 * 200001 // 2
+    finally:
+        conn.close()
+    entries = log.entries()
+    assert len(entries) == 1
+    assert entries[0]['sql'].startswith('WITH RECURSIVE')
+    assert entries[0]['rows'] == 1
+
+def test_database_writes_are_timed(db_path):
+    db = Database(db_path=db_path, slow_query_ms=0)
+    try:
+        db.save_record(make_record())
+        record_id = db.get_recent_records(1)[0]['id']
+        db.slow_queries.clear()
+        db.delete_record(record_id)
+        statements = [entry['sql'] for entry in db.slow_queries.entries()]
+    finally:
+        db.close()
+    assert any(sql.startswith('DELETE FROM performance_records') for sql in statements)
+
+def test_recorder_is_off_by_default(db_path):
+    db = Database(db_path=db_path)
+    try:
+        assert db.slow_queries is None
+        with db._get_connection() as conn:
+            assert type(conn) is sqlite3.Connection
+    finally:
+        db.close()
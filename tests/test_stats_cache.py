@@ -0,0 +1,33 @@
+import threading
+from datetime import datetime
+from .conftest import make_record
+
+def test_read_racing_a_write_is_not_cached(db):
+    """A stats result computed before a concurrent commit must not outlive it."""
+    original = db.get_performance_percentiles
+    calls = []
+
+    def percentiles_with_concurrent_write(*args):
+        # The daily rollup has already been read; commit a record from another thread.
+        if not calls:
+            writer = threading.Thread(target=lambda: db.save_record(make_record()))
+            writer.start()
+            writer.join()
+        calls.append(args)
+        return original(*args)
+
+    db.get_performance_percentiles = percentiles_with_concurrent_write
+    today = datetime.now()
+    assert db.get_daily_stats(today)['total_records'] == 0
+    assert db.get_daily_stats(today)['total_records'] == 1
+    assert db.get_daily_stats(today)['total_records'] == 1
+
+def test_write_invalidates_cached_stats(db):
+    today = datetime.now()
+    assert db.get_daily_stats(today)['total_records'] == 0
+    version = db.data_version
+    db.save_record(make_record(performance_percentage=120.0))
+    assert db.data_version != version
+    stats = db.get_daily_stats(today)
+    assert stats['total_records'] == 1
+    assert stats['best_performance'] == 120.0
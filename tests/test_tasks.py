@@ -0,0 +1,113 @@
+import sqlite3
+from preformancetracker.database import Database
+from .conftest import assert_histogram_matches_raw, assert_search_index_intact, assert_rollups_match_raw, make_record
+
+# Schema of databases created before migrations were tracked in user_version.
+BASELINE_SCHEMA = '''
+    CREATE TABLE performance_records (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        task_name TEXT NOT NULL,
+        target_time REAL NOT NULL,
+        actual_time REAL NOT NULL,
+        performance_percentage REAL NOT NULL,
+        start_time TEXT NOT NULL,
+        end_time TEXT NOT NULL,
+        break_time REAL DEFAULT 0,
+        has_break BOOLEAN DEFAULT 0,
+        delays_time REAL DEFAULT 0,
+        has_delays BOOLEAN DEFAULT 0,
+        delay_notes TEXT,
+        skill TEXT,
+        paid_break_time REAL DEFAULT 0,
+        unpaid_break_time REAL DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE shifts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        start_time TEXT NOT NULL,
+        end_time TEXT,
+        skill TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+'''
+
+BASELINE_ROWS = [
+    # task_name, target_time, actual_time, performance, delays_time, delay_notes, created_at
+    ('Pick Aisle A', 45, 45, 100.0, 0, '', '2024-03-04 08:00:00'),
+    ('Pick Aisle A', 45, 50, 90.0, 5, 'Scanner fault', '2024-03-04 09:00:00'),
+    ('Pick Frozen', 25, 20, 125.0, 0, None, '2024-03-05 08:30:00'),
+    ('Pick Aisle A', 30, 30, 100.0, 0, 'Blocked aisle', '2024-03-06 10:00:00'),
+]
+
+def _baseline_database(path):
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.executescript(BASELINE_SCHEMA)
+        conn.executemany('''
+            INSERT INTO performance_records (
+                task_name, target_time, actual_time, performance_percentage, start_time, end_time,
+                delays_time, has_delays, delay_notes, skill, created_at
+            ) VALUES (?, ?, ?, ?, '08:00', '08:45', ?, ?, ?, 'Picker', ?)
+        ''', [(name, target, actual, perf, delay, delay > 0, notes, created)
+              for name, target, actual, perf, delay, notes, created in BASELINE_ROWS])
+        conn.execute("INSERT INTO shifts (start_time, skill) VALUES ('06:00', 'Picker')")
+    conn.close()
+
+def test_baseline_database_migrates_to_current_schema(db_path):
+    _baseline_database(db_path)
+    db = Database(db_path=db_path, slow_query_ms=None)
+    db.close()
+
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute('PRAGMA user_version').fetchone()[0] == 7
+        assert conn.execute('PRAGMA integrity_check').fetchone()[0] == 'ok'
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(performance_records)')}
+        assert 'task_id' in columns and 'task_name' not in columns and 'work_date' in columns
+
+        migrated = conn.execute('''
+            SELECT task_name, target_time, actual_time, performance_percentage, delays_time,
+                   delay_notes, created_at
+            FROM task_records ORDER BY id
+        ''').fetchall()
+        assert migrated == [
+            (name, float(target), float(actual), perf, float(delay), notes, created)
+            for name, target, actual, perf, delay, notes, created in BASELINE_ROWS
+        ]
+        assert conn.execute('SELECT COUNT(*) FROM tasks').fetchone()[0] == 3
+        assert conn.execute('SELECT COUNT(*) FROM performance_records WHERE work_date IS NULL').fetchone()[0] == 0
+        assert conn.execute('SELECT COUNT(*) FROM shifts').fetchone()[0] == 1
+        assert_rollups_match_raw(conn)
+        assert_histogram_matches_raw(conn)
+        assert_search_index_intact(conn)
+    finally:
+        conn.close()
+
+    db = Database(db_path=db_path, slow_query_ms=None)
+    try:
+        assert [r['delay_notes'] for r in db.search_records('scanner')] == ['Scanner fault']
+        assert db.count_records() == len(BASELINE_ROWS)
+    finally:
+        db.close()
+
+def test_records_share_one_task_row(db_path):
+    db = Database(db_path=db_path, slow_query_ms=None)
+    try:
+        first = db.get_or_create_task('Pick Aisle A', 45)
+        db.save_record(make_record())
+        db.save_record(make_record(target_time=45.0))
+        db.save_record(make_record(target_time=30))
+        assert db.get_or_create_task('Pick Aisle A', 45.0) == first
+        assert db.get_task_by_name('Pick Aisle A', 45)['id'] == first
+    finally:
+        db.close()
+
+    # A fresh instance finds the existing rows instead of creating duplicates.
+    db = Database(db_path=db_path, slow_query_ms=None)
+    try:
+        assert db.get_or_create_task('Pick Aisle A', 45) == first
+        tasks = db._execute('SELECT name, target_time FROM tasks ORDER BY id', fetch='all')
+        assert tasks == [{'name': 'Pick Aisle A', 'target_time': 45.0}, {'name': 'Pick Aisle A', 'target_time': 30.0}]
+        assert [r['task_id'] for r in db.get_recent_records(3)].count(first) == 2
+    finally:
+        db.close()
@@ -0,0 +1,50 @@
+import pytest
+from preformancetracker.database import Database
+from .conftest import make_record
+
+def test_writes_in_one_window_share_a_commit(db_path):
+    db = Database(db_path=db_path, slow_query_ms=None, commit_window_ms=200)
+    statements = []
+    db.set_trace_callback(statements.append)
+    try:
+        handles = [db.save_record(make_record(performance_percentage=p)) for p in (90.0, 100.0, 110.0)]
+        for handle in handles:
+            handle.result(5)
+        assert statements.count('COMMIT') == 1
+    finally:
+        db.close()
+
+def test_close_commits_queued_writes(db_path):
+    db = Database(db_path=db_path, slow_query_ms=None, commit_window_ms=10_000)
+    handle = db.save_record(make_record())
+    db.close()
+    assert handle.done() and handle.exception() is None
+
+    db = Database(db_path=db_path, slow_query_ms=None)
+    try:
+        assert db.count_records() == 1
+    finally:
+        db.close()
+
+def test_failing_write_is_rolled_back_alone(db_path):
+    db = Database(db_path=db_path, slow_query_ms=None, commit_window_ms=200)
+    try:
+        bad = make_record(task_name='Broken task')
+        del bad['skill']
+        handles = [
+            db.save_record(make_record(performance_percentage=110.0)),
+            db.save_record(bad),
+            db.save_record(make_record(task_name='Pick Frozen', target_time=25)),
+        ]
+        handles[0].result(5)
+        with pytest.raises(KeyError):
+            handles[1].result(5)
+        handles[2].result(5)
+
+        assert sorted(r['task_name'] for r in db.get_recent_records(10)) == ['Pick Aisle A', 'Pick Frozen']
+        # The task the failed write created was rolled back with it, and a later write recreates it.
+        assert db._execute("SELECT COUNT(*) AS n FROM tasks WHERE name = 'Broken task'", fetch='one')['n'] == 0
+        db.save_record(make_record(task_name='Broken task')).result(5)
+        assert db.count_records() == 3
+    finally:
+        db.close()
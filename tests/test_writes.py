@@ -0,0 +1,34 @@
+import pytest
+from preformancetracker.database import Database
+
+def _form(**overrides):
+    data = {
+        'task_name': 'Pick Chilled', 'target_time': 30, 'start_time': '09:00', 'finish_time': '09:30',
+        'break_type': None, 'delays_time': 0, 'has_delays': False, 'delay_notes': '',
+        'battery_count': 0, 'paid_break_time': 0, 'unpaid_break_time': 0,
+    }
+    data.update(overrides)
+    return data
+
+METRICS = {'actual_work_time': 30, 'performance': 100.0}
+
+@pytest.mark.parametrize('commit_window_ms', [None, 20])
+def test_insert_and_update_record_return_durable_handles(db_path, commit_window_ms):
+    db = Database(db_path=db_path, slow_query_ms=None, commit_window_ms=commit_window_ms)
+    try:
+        db.insert_record(_form(), METRICS).result(5)
+        record = db.get_recent_records(1)[0]
+        assert record['task_name'] == 'Pick Chilled'
+
+        db.update_record(record['id'], _form(delay_notes='Scanner fault'), {'actual_work_time': 25, 'performance': 120.0}).result(5)
+        updated = db.get_record_by_id(record['id'])
+        assert updated['delay_notes'] == 'Scanner fault'
+        assert updated['performance_percentage'] == 120.0
+    finally:
+        db.close()
+
+def test_insert_record_failure_is_raised_and_leaves_no_task(db):
+    with pytest.raises(KeyError):
+        # Missing metrics fail after the task row has been created in the same transaction.
+        db.insert_record(_form(task_name='Never saved'), {})
+    assert db._execute("SELECT COUNT(*) AS n FROM tasks WHERE name = 'Never saved'", fetch='one')['n'] == 0